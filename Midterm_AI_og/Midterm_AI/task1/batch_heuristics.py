@@ -0,0 +1,73 @@
+# task1/batch_heuristics.py
+# Vectorized H0 / H1 over an (N, 9) uint8 array of states (needs numpy)
+from typing import Callable, Dict, Sequence, Tuple, Union
+
+import numpy as np
+
+from task1.puzzle_rule import SWAP_PAIRS, CORNER_PAIRS
+from task1.requirement_2 import GOALS
+
+GOALS_ARR = np.array(GOALS, dtype=np.uint8)                         # (4, 9)
+_PAIRS = SWAP_PAIRS + CORNER_PAIRS
+_PI = np.array([i for i, _ in _PAIRS])
+_PJ = np.array([j for _, j in _PAIRS])
+_IS_CORNER = np.array([False] * len(SWAP_PAIRS) + [True] * len(CORNER_PAIRS))
+
+States = Union[np.ndarray, Sequence[Tuple[int, ...]]]
+
+
+def to_array(states: States) -> np.ndarray:
+    """States as an (N, 9) uint8 array."""
+    return np.asarray(states, dtype=np.uint8).reshape(-1, 9)
+
+
+def h0_batch(states: States) -> np.ndarray:
+    """H0 for every row."""
+    return np.zeros(len(to_array(states)))
+
+
+def h1_batch(states: States) -> np.ndarray:
+    """h1_misplaced_swap_adjust for every row, same values as the scalar version.
+    The swap bonus counts pairs (i, j) with state[i] == g[j] and state[j] == g[i];
+    such 2-cycles against a goal never share a cell, so no 'used' bookkeeping is needed."""
+    S = to_array(states)
+    tile = S != 0
+    # misplaced against all goals at once: (N, 4); argmin keeps the first best goal like the loop
+    mis = ((S[:, None, :] != GOALS_ARR[None, :, :]) & tile[:, None, :]).sum(axis=2)
+    best = mis.argmin(axis=1)
+    G = GOALS_ARR[best]                                              # (N, 9)
+
+    a, b = S[:, _PI], S[:, _PJ]                                      # (N, pairs)
+    swapped = (a != 0) & (b != 0) & (b == G[:, _PI]) & (a == G[:, _PJ])
+    allowed = _IS_CORNER[None, :] | (a.astype(np.int16) + b == 9)
+    pairs = (swapped & allowed).sum(axis=1)
+
+    return np.maximum(0, mis[np.arange(len(S)), best] - pairs).astype(float)
+
+
+BATCH_HEURISTICS: Dict[str, Callable[[States], np.ndarray]] = {
+    "H0": h0_batch,
+    "H1": h1_batch,
+}
+
+
+if __name__ == "__main__":
+    #quick test for this file
+    import time
+    from task1.requirement_2 import h1_misplaced_swap_adjust
+    from task1.puzzle_rule import PuzzleProblem
+    from task1.state_index import unrank
+
+    rng = np.random.default_rng(0)
+    states = [unrank(int(r)) for r in rng.integers(0, 362880, 20000)]
+    t0 = time.perf_counter()
+    ref = [h1_misplaced_swap_adjust(s) for s in states]
+    t1 = time.perf_counter()
+    got = h1_batch(states)
+    t2 = time.perf_counter()
+    print("H1 batch matches scalar:", bool((got == np.array(ref)).all()))
+    print(f"scalar {1000 * (t1 - t0):.1f} ms, batch {1000 * (t2 - t1):.1f} ms for {len(states)} states")
+
+    # score a whole BFS layer in one call
+    layer = [s for _, s, _ in PuzzleProblem(states[0]).successors(states[0])]
+    print("Layer H1:", h1_batch(layer))
@@ -0,0 +1,78 @@
+# task1/batch_solve.py
+# One-to-many solving: a single reverse search from GOAL answers a whole batch of starts
+import time
+from typing import List, Optional, Sequence, Tuple
+
+from task1.puzzle_rule import PuzzleProblem, GOAL, encode
+from task1.state_index import DenseStateIndex, ACTIONS, ACTION_CODE, NO_ACTION, NO_PARENT, rank, rank_packed
+from task1.requirement_4 import _Metrics
+
+
+def solve_many(starts: Sequence[Tuple[int, ...]], goal: Tuple[int, ...] = GOAL,
+               time_limit_sec: float = 60.0) -> Tuple[List[Tuple[Optional[List], Optional[float]]], _Metrics]:
+    """Optimal plans for every start from one layered BFS rooted at goal.
+    Moves are self-inverse with unit cost, so BFS depth from goal is the cost to
+    reach goal, and a state's BFS parent is its next step towards goal (same action
+    label). The search stops as soon as every requested start has been labelled.
+    Returns [(actions, cost), ...] aligned with starts (None, None if not reached)."""
+    start_t = time.perf_counter()
+    M = _Metrics()
+    idx = DenseStateIndex()
+    succ = PuzzleProblem(goal).successors_packed
+
+    pending = {rank(s) for s in starts}
+    code = encode(goal)
+    r0 = rank_packed(code)
+    idx.record(r0, 0.0, NO_PARENT, NO_ACTION)
+    idx.closed[r0] = 1
+    pending.discard(r0)
+    layer = [code]
+
+    while layer and pending:
+        if (time.perf_counter() - start_t) > time_limit_sec:
+            break
+        nxt = []
+        for code in layer:
+            r = rank_packed(code)
+            g = idx.g[r]
+            for action, c2, cost in succ(code):
+                r2 = rank_packed(c2)
+                if idx.closed[r2]:
+                    continue
+                idx.closed[r2] = 1
+                idx.record(r2, g + cost, r, ACTION_CODE[action])
+                M.expanded += 1
+                pending.discard(r2)
+                nxt.append(c2)
+            if not pending:
+                break
+        layer = nxt
+        M.max_fringe = max(M.max_fringe, len(layer))
+
+    results = []
+    for s in starts:
+        r = rank(s)
+        if not idx.closed[r]:
+            results.append((None, None))
+            continue
+        cost = idx.g[r]
+        acts = []
+        while idx.parent[r] != NO_PARENT:
+            acts.append(ACTIONS[idx.action[r]])
+            r = idx.parent[r]
+        results.append((acts, cost))
+    M.time_ms = (time.perf_counter() - start_t) * 1000
+    return results, M
+
+
+if __name__ == "__main__":
+    #quick test for this file
+    from task1.requirement_4 import astar, scramble_from_goal
+    from task1.requirement_2 import h0_zero
+
+    starts = [scramble_from_goal(k, seed=i) for i, k in enumerate([5, 10, 15, 20] * 250)]
+    results, M = solve_many(starts)
+    print(f"solve_many: {len(starts)} starts, expanded={M.expanded}, time_ms={M.time_ms:.1f}")
+    for s, (acts, cost) in list(zip(starts, results))[:4]:
+        ref = astar(PuzzleProblem(s), heuristic_override=h0_zero)[1]
+        print(f"  {s} cost={cost} (astar: {ref}) plan={acts}")
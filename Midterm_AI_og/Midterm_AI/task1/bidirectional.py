@@ -0,0 +1,196 @@
+# task1/bidirectional.py
+# Bidirectional search: every PuzzleProblem move is its own inverse, so the
+# goal side can expand with problem.successors() and reuse the same action labels.
+import heapq
+import itertools
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from task1.puzzle_rule import GOAL
+from task1.requirement_4 import _Metrics
+
+INF = float("inf")
+
+
+def _half_misplaced(targets: Sequence[Tuple[int, ...]]) -> Callable[[Tuple[int, ...]], float]:
+    """Admissible estimate of the distance to the nearest target: one move relocates at most two tiles."""
+    def h(s: Tuple[int, ...]) -> float:
+        mis = min(sum(1 for i, v in enumerate(s) if v != 0 and v != t[i]) for t in targets)
+        return float((mis + 1) // 2)
+    return h
+
+
+def _join(fwd: Dict, bwd: Dict, meet: Hashable) -> List:
+    """Actions start -> meet from the forward parents, then meet -> goal from the backward ones."""
+    acts = []
+    s = meet
+    while fwd[s][0] is not None:
+        s, a = fwd[s][0], fwd[s][1]
+        acts.append(a)
+    acts.reverse()
+    s = meet
+    while bwd[s][0] is not None:
+        acts.append(bwd[s][1])
+        s = bwd[s][0]
+    return acts
+
+
+def bidirectional_bfs(problem: Any, goal: Optional[Tuple[int, ...]] = None,
+                      time_limit_sec: float = 10.0) -> Tuple[Optional[List], Optional[float], _Metrics]:
+    """Front-to-end bidirectional BFS (unit-cost moves, H0).
+    Always expands one full layer of the smaller frontier; the first layer that
+    touches the other side holds the optimal meeting point, so stop after it.
+    The backward side starts from goal, or from all of problem.goals at once when goal is None."""
+    start_t = time.perf_counter()
+    start = problem.initial_state()
+    M = _Metrics()
+    if problem.is_goal(start):
+        M.time_ms = (time.perf_counter() - start_t) * 1000
+        return [], 0.0, M
+
+    # state -> (parent, action, g)
+    fwd: Dict[Hashable, Tuple] = {start: (None, None, 0.0)}
+    goals = [goal] if goal is not None else list(getattr(problem, "goals", (GOAL,)))
+    bwd: Dict[Hashable, Tuple] = {g: (None, None, 0.0) for g in goals}
+    front_f, front_b = [start], list(bwd)
+
+    while front_f and front_b:
+        if (time.perf_counter() - start_t) > time_limit_sec:
+            M.time_ms = (time.perf_counter() - start_t) * 1000
+            return None, None, M
+
+        forward = len(front_f) <= len(front_b)
+        mine, other, front = (fwd, bwd, front_f) if forward else (bwd, fwd, front_b)
+        best, meet = INF, None
+        nxt = []
+        for s in front:
+            g = mine[s][2]
+            for action, s2, cost in problem.successors(s):
+                if s2 in mine:
+                    continue
+                mine[s2] = (s, action, g + cost)
+                nxt.append(s2)
+                M.expanded += 1
+                if s2 in other and g + cost + other[s2][2] < best:
+                    best, meet = g + cost + other[s2][2], s2
+        if forward:
+            front_f = nxt
+        else:
+            front_b = nxt
+        M.max_fringe = max(M.max_fringe, len(front_f) + len(front_b))
+
+        if meet is not None:
+            M.time_ms = (time.perf_counter() - start_t) * 1000
+            return _join(fwd, bwd, meet), best, M
+
+    M.time_ms = (time.perf_counter() - start_t) * 1000
+    return None, None, M
+
+
+class _Side:
+    """Open/closed bookkeeping for one direction of MM.
+    Open entries live in three lazy heaps keyed by pr = max(f, 2g), f and g."""
+    def __init__(self, roots: Sequence[Hashable], h: Callable[[Hashable], float]):
+        self.h = h
+        self.g: Dict[Hashable, float] = {}
+        self.parent: Dict[Hashable, Tuple] = {}
+        self.open: set = set()
+        self.heaps: Tuple[List, List, List] = ([], [], [])
+        self._c = itertools.count()
+        for root in roots:
+            self.push(root, 0.0, None, None)
+
+    def push(self, s: Hashable, g: float, parent: Hashable, action: Any):
+        self.g[s] = g
+        self.parent[s] = (parent, action)
+        self.open.add(s)
+        f = g + self.h(s)
+        c = next(self._c)
+        for heap, key in zip(self.heaps, (max(f, 2 * g), f, g)):
+            heapq.heappush(heap, (key, c, g, s))
+
+    def _top(self, k: int):
+        heap = self.heaps[k]
+        while heap and (heap[0][3] not in self.open or self.g[heap[0][3]] != heap[0][2]):
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def min_key(self, k: int) -> float:
+        top = self._top(k)
+        return top[0] if top else INF
+
+    def pop(self) -> Hashable:
+        s = self._top(0)[3]
+        self.open.discard(s)
+        return s
+
+
+def bidirectional_astar(problem: Any, heuristic: Optional[Callable[[Hashable], float]] = None,
+                        reverse_heuristic: Optional[Callable[[Hashable], float]] = None,
+                        goal: Optional[Tuple[int, ...]] = None, time_limit_sec: float = 10.0,
+                        epsilon: float = 1.0) -> Tuple[Optional[List], Optional[float], _Metrics]:
+    """Meet-in-the-middle bidirectional heuristic search (MM, Holte et al. 2016).
+       - the backward side starts from goal, or from all of problem.goals at once when goal is None
+       - heuristic estimates the distance to the nearest of those goals, reverse_heuristic the
+         distance to the start; when only one is given the other defaults to half the misplaced
+         tiles (w.r.t. the start, or the minimum over the goals)
+       - stops once U <= max(C, fminF, fminB, gminF + gminB + epsilon), epsilon = cheapest move
+       Optimal whenever both heuristics are admissible."""
+    start_t = time.perf_counter()
+    start = problem.initial_state()
+    M = _Metrics()
+    if problem.is_goal(start):
+        M.time_ms = (time.perf_counter() - start_t) * 1000
+        return [], 0.0, M
+
+    goals = [goal] if goal is not None else list(getattr(problem, "goals", (GOAL,)))
+    hf = heuristic or (_half_misplaced(goals) if reverse_heuristic else (lambda s: 0.0))
+    hb = reverse_heuristic or (_half_misplaced([start]) if heuristic else (lambda s: 0.0))
+    fwd, bwd = _Side([start], hf), _Side(goals, hb)
+    U, meet = INF, None
+
+    while fwd.open and bwd.open:
+        if (time.perf_counter() - start_t) > time_limit_sec:
+            M.time_ms = (time.perf_counter() - start_t) * 1000
+            return None, None, M
+
+        pr_f, pr_b = fwd.min_key(0), bwd.min_key(0)
+        bound = max(min(pr_f, pr_b), fwd.min_key(1), bwd.min_key(1),
+                    fwd.min_key(2) + bwd.min_key(2) + epsilon)
+        if U <= bound:
+            break
+
+        side, other = (fwd, bwd) if pr_f <= pr_b else (bwd, fwd)
+        s = side.pop()
+        g = side.g[s]
+        for action, s2, cost in problem.successors(s):
+            g2 = g + cost
+            if side.g.get(s2, INF) <= g2:
+                continue
+            side.push(s2, g2, s, action)
+            M.expanded += 1
+            if s2 in other.g and g2 + other.g[s2] < U:
+                U, meet = g2 + other.g[s2], s2
+        M.max_fringe = max(M.max_fringe, len(fwd.open) + len(bwd.open))
+
+    M.time_ms = (time.perf_counter() - start_t) * 1000
+    if meet is None:
+        return None, None, M
+    return _join(fwd.parent, bwd.parent, meet), U, M
+
+
+if __name__ == "__main__":
+    #quick test for this file
+    from task1.puzzle_rule import PuzzleProblem
+    from task1.requirement_2 import h0_zero
+    from task1.requirement_4 import astar, scramble_from_goal
+    from task1.pattern_db import h_pdb_max
+
+    for k in (10, 20, 40):
+        s = scramble_from_goal(k, seed=3)
+        prob = PuzzleProblem(s)
+        for name, run in [("A* H0", lambda: astar(prob, h0_zero)),
+                          ("BiBFS", lambda: bidirectional_bfs(prob)),
+                          ("MM PDB", lambda: bidirectional_astar(prob, h_pdb_max))]:
+            acts, cost, m = run()
+            print(f"k={k:2d} {name:7s} cost={cost} expanded={m.expanded} max_fringe={m.max_fringe} time_ms={m.time_ms:.1f}")
@@ -0,0 +1,60 @@
+# task1/bitstate.py
+# Bitstate hashing: an approximate visited set in a fixed number of bits
+import math
+from typing import Hashable, List
+
+_MASK64 = (1 << 64) - 1
+
+
+class BitStateSet:
+    """Bloom filter over hashable states: a bit array of size bits with k hash functions.
+    Never forgets a state it has seen; a new state is wrongly reported as seen (and so
+    omitted by the search) with probability false_positive_rate()."""
+    def __init__(self, bits: int = 1 << 24, hashes: int = 3):
+        if bits < 8 or hashes < 1:
+            raise ValueError("Bitstate needs at least 8 bits and 1 hash")
+        self.m = bits
+        self.k = hashes
+        self.bits = bytearray((bits + 7) // 8)
+        self.n = 0  # states added
+
+    def _indexes(self, item: Hashable) -> List[int]:
+        # double hashing: h1 + i * h2 over one mixed 64-bit hash
+        x = ((hash(item) & _MASK64) * 0x9E3779B97F4A7C15) & _MASK64
+        h1, h2 = x >> 32, (x & 0xFFFFFFFF) | 1
+        return [(h1 + i * h2) % self.m for i in range(self.k)]
+
+    def add(self, item: Hashable) -> bool:
+        """Set the item's bits; True if at least one was unset (the item is new)."""
+        new = False
+        bits = self.bits
+        for i in self._indexes(item):
+            byte, mask = i >> 3, 1 << (i & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                new = True
+        if new:
+            self.n += 1
+        return new
+
+    def __contains__(self, item: Hashable) -> bool:
+        bits = self.bits
+        return all(bits[i >> 3] & (1 << (i & 7)) for i in self._indexes(item))
+
+    def false_positive_rate(self) -> float:
+        """(1 - e^(-k n / m))^k: chance that an unseen state looks visited right now."""
+        return (1.0 - math.exp(-self.k * self.n / self.m)) ** self.k
+
+    def nbytes(self) -> int:
+        return len(self.bits)
+
+
+if __name__ == "__main__":
+    #quick test for this file
+    from task1.state_index import unrank
+
+    for bits in (1 << 16, 1 << 20, 1 << 24):
+        seen = BitStateSet(bits, 3)
+        missed = sum(1 for r in range(362880) if not seen.add(unrank(r)))
+        print(f"bits={bits:>9d} ({seen.nbytes() // 1024} KB): missed {missed} of 362880 states, "
+              f"estimated omission probability {seen.false_positive_rate():.2e}")
@@ -0,0 +1,196 @@
+# task1/external_bfs.py
+# External-memory BFS: layers live on disk as sorted, delta-encoded run files
+import heapq
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from task1.puzzle_rule import PuzzleProblem, encode, decode
+from task1.requirement_4 import _Metrics
+
+CHUNK = 1 << 16
+
+
+@dataclass
+class ExternalStats:
+    layer_sizes: List[int] = field(default_factory=list)
+    bytes_written: int = 0
+    bytes_read: int = 0
+    runs: int = 0  # sorted spill files written while expanding layers
+
+
+class _RunWriter:
+    """Strictly increasing packed codes as LEB128 varints of the gaps."""
+    def __init__(self, path: str, stats: ExternalStats):
+        self.f = open(path, "wb")
+        self.stats = stats
+        self.buf = bytearray()
+        self.prev = 0
+        self.count = 0
+
+    def add(self, code: int):
+        d = code - self.prev
+        self.prev = code
+        buf = self.buf
+        while d >= 0x80:
+            buf.append((d & 0x7F) | 0x80)
+            d >>= 7
+        buf.append(d)
+        self.count += 1
+        if len(buf) >= CHUNK:
+            self._flush()
+
+    def _flush(self):
+        self.f.write(self.buf)
+        self.stats.bytes_written += len(self.buf)
+        self.buf = bytearray()
+
+    def close(self):
+        self._flush()
+        self.f.close()
+
+
+def read_run(path: str, stats: ExternalStats) -> Iterator[int]:
+    """Stream the codes of a run file back, CHUNK bytes at a time."""
+    with open(path, "rb") as f:
+        code = d = shift = 0
+        while True:
+            chunk = f.read(CHUNK)
+            if not chunk:
+                return
+            stats.bytes_read += len(chunk)
+            for b in chunk:
+                d |= (b & 0x7F) << shift
+                if b & 0x80:
+                    shift += 7
+                else:
+                    code += d
+                    yield code
+                    d = shift = 0
+
+
+def _unique(codes: Iterable[int]) -> Iterator[int]:
+    last = None
+    for c in codes:
+        if c != last:
+            yield c
+            last = c
+
+
+def _difference(a: Iterator[int], b: Iterator[int]) -> Iterator[int]:
+    """Sorted a minus sorted b, both streamed."""
+    y = next(b, None)
+    for x in a:
+        while y is not None and y < x:
+            y = next(b, None)
+        if x != y:
+            yield x
+
+
+def _write_run(path: str, codes: Iterable[int], stats: ExternalStats) -> int:
+    w = _RunWriter(path, stats)
+    for c in codes:
+        w.add(c)
+    w.close()
+    return w.count
+
+
+def external_bfs(problem: PuzzleProblem, time_limit_sec: float = 60.0, work_dir: Optional[str] = None,
+                 buffer_size: int = 1 << 16, enumerate_all: bool = False
+                 ) -> Tuple[Optional[List], Optional[float], _Metrics, ExternalStats]:
+    """BFS with delayed duplicate detection; RAM holds at most buffer_size successors plus read buffers.
+       - successors of layer d are buffered, sorted and spilled as runs, then k-way merged
+       - every move is its own inverse, so a child is either new or already in layer d or d - 1:
+         the merged stream minus those two layers (streamed from disk) is layer d + 1
+       - the plan is walked back by finding, layer by layer, a successor stored in the layer before
+       enumerate_all: ignore the goal and sweep the whole reachable space (layer sizes in stats).
+       work_dir: keeps layer_<d>.run files there; by default a temporary directory is removed afterwards.
+       Returns (actions, cost, metrics, stats) with per-layer sizes and bytes written / read."""
+    start_t = time.perf_counter()
+    M = _Metrics()
+    stats = ExternalStats()
+    own_dir = work_dir is None
+    work_dir = work_dir or tempfile.mkdtemp(prefix="external_bfs_")
+    os.makedirs(work_dir, exist_ok=True)
+    succ = problem.successors_packed
+    layer_path = lambda d: os.path.join(work_dir, "layer_%d.run" % d)
+
+    start = problem.initial_state()
+    code0 = encode(start)
+    stats.layer_sizes.append(_write_run(layer_path(0), [code0], stats))
+    goal_depth, goal_code = (0, code0) if (problem.is_goal(start) and not enumerate_all) else (None, None)
+
+    try:
+        d = 0
+        while goal_depth is None and stats.layer_sizes[-1]:
+            if (time.perf_counter() - start_t) > time_limit_sec:
+                break
+            # Expand layer d into sorted spill runs
+            runs, buf = [], []
+            for code in read_run(layer_path(d), stats):
+                for _, c2, _ in succ(code):
+                    buf.append(c2)
+                if len(buf) >= buffer_size:
+                    runs.append(os.path.join(work_dir, "spill_%d.run" % len(runs)))
+                    _write_run(runs[-1], sorted(set(buf)), stats)
+                    buf = []
+            if buf:
+                runs.append(os.path.join(work_dir, "spill_%d.run" % len(runs)))
+                _write_run(runs[-1], sorted(set(buf)), stats)
+            stats.runs += len(runs)
+
+            # Merge, drop layers d and d - 1, write layer d + 1
+            merged = _unique(heapq.merge(*[read_run(r, stats) for r in runs]))
+            old = heapq.merge(*[read_run(layer_path(k), stats) for k in (d, d - 1) if k >= 0])
+            w = _RunWriter(layer_path(d + 1), stats)
+            for c in _difference(merged, old):
+                w.add(c)
+                if goal_code is None and not enumerate_all and problem.is_goal(decode(c)):
+                    goal_depth, goal_code = d + 1, c
+            w.close()
+            for r in runs:
+                os.remove(r)
+            d += 1
+            stats.layer_sizes.append(w.count)
+            M.expanded += w.count
+            M.max_fringe = max(M.max_fringe, w.count)
+
+        actions = None
+        if goal_depth is not None:
+            # Walk back: some successor of the current state sits in the previous layer
+            actions = []
+            code = goal_code
+            for k in range(goal_depth - 1, -1, -1):
+                kids = {c2: a for a, c2, _ in succ(code)}
+                for c in read_run(layer_path(k), stats):
+                    if c in kids:
+                        actions.append(kids[c])
+                        code = c
+                        break
+            actions.reverse()
+    finally:
+        if own_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    M.time_ms = (time.perf_counter() - start_t) * 1000
+    if actions is None:
+        return None, None, M, stats
+    return actions, float(goal_depth), M, stats
+
+
+if __name__ == "__main__":
+    #quick test for this file
+    from task1.puzzle_rule import GOAL
+    from task1.state_index import unrank
+    from task1.oracle import get_table
+
+    acts, cost, m, st = external_bfs(PuzzleProblem(GOAL), enumerate_all=True, buffer_size=50_000, time_limit_sec=600)
+    print(f"Full sweep: {sum(st.layer_sizes)} states in {len(st.layer_sizes) - 1} layers, "
+          f"time_ms={m.time_ms:.0f}, written={st.bytes_written / 1e6:.1f}MB, read={st.bytes_read / 1e6:.1f}MB, runs={st.runs}")
+    print("Layer sizes:", st.layer_sizes)
+    s = unrank(123456)
+    acts, cost, m, st = external_bfs(PuzzleProblem(s))
+    print(f"cost={cost} (oracle {get_table().dist(s)}) plan length={len(acts)} time_ms={m.time_ms:.0f}")
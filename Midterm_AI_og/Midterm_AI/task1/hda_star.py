@@ -0,0 +1,192 @@
+# task1/hda_star.py
+# Hash-distributed A* (HDA*, Kishimoto et al. 2009) over worker processes
+import heapq
+import multiprocessing as mp
+import os
+import queue
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from task1.puzzle_rule import PuzzleProblem, encode, decode
+from task1.state_index import ACTIONS, ACTION_CODE
+from task1.requirement_4 import _Metrics
+
+INF = float("inf")
+NO_PARENT = -1
+
+
+def owner(code: int, workers: int) -> int:
+    """Worker that owns a packed state (multiplicative hash, spreads similar boards)."""
+    return (((code * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> 32) % workers
+
+
+def _worker(wid: int, problem: PuzzleProblem, heuristic: Callable, inboxes: List, results,
+            sent, recv, idle, incumbent, goal_code, batch_size: int):
+    """One HDA* worker: owns the states hashing to wid and keeps their open list, g and parents.
+    Successors owned elsewhere are buffered per destination and sent as ("batch", [...]) messages.
+    Nodes with f >= incumbent are kept but not expanded; the worker is idle when nothing is left
+    below the incumbent, its inbox is empty and all buffers are flushed."""
+    P = len(inboxes)
+    inbox = inboxes[wid]
+    openh: List[Tuple[float, int, float, int]] = []
+    g: Dict[int, float] = {}
+    parent: Dict[int, Tuple[int, int]] = {}
+    out: List[List] = [[] for _ in range(P)]
+    c = 0
+    expanded = 0
+    max_open = 0
+
+    def add(code: int, g2: float, pcode: int, acode: int):
+        nonlocal c
+        if g2 < g.get(code, INF):
+            g[code] = g2
+            parent[code] = (pcode, acode)
+            heapq.heappush(openh, (g2 + heuristic(decode(code)), c, g2, code))
+            c += 1
+
+    def flush():
+        for dest in range(P):
+            if out[dest]:
+                sent[wid] += 1
+                inboxes[dest].put(("batch", out[dest]))
+                out[dest] = []
+
+    wait = False
+    while True:
+        # Inbox first: it may hold control messages or work; an idle worker blocks briefly
+        while True:
+            try:
+                msg = inbox.get(True, 0.005) if wait else inbox.get_nowait()
+            except queue.Empty:
+                break
+            wait = False
+            kind = msg[0]
+            if kind == "batch":
+                idle[wid] = 0
+                recv[wid] += 1
+                for code, g2, pcode, acode in msg[1]:
+                    add(code, g2, pcode, acode)
+            elif kind == "trace":
+                results.put(("trace",) + parent.get(msg[1], (NO_PARENT, 0)))
+            elif kind == "stop":
+                results.put(("stats", expanded, max_open))
+                return
+
+        # Expand up to batch_size nodes below the incumbent, then flush
+        bound = incumbent.value
+        n = 0
+        while openh and n < batch_size:
+            f, _, g1, code = openh[0]
+            if g1 != g[code]:
+                heapq.heappop(openh)
+                continue
+            if f >= bound:
+                break
+            heapq.heappop(openh)
+            n += 1
+            if problem.is_goal(decode(code)):
+                with incumbent.get_lock():
+                    if g1 < incumbent.value:
+                        incumbent.value = g1
+                        goal_code.value = code
+                bound = incumbent.value
+                continue
+            for action, c2, cost in problem.successors_packed(code):
+                expanded += 1
+                dest = owner(c2, P)
+                if dest == wid:
+                    add(c2, g1 + cost, code, ACTION_CODE[action])
+                else:
+                    out[dest].append((c2, g1 + cost, code, ACTION_CODE[action]))
+        flush()
+        max_open = max(max_open, len(openh))
+        if n == 0:
+            idle[wid] = 1
+            wait = True
+
+
+def hda_star(problem: PuzzleProblem, heuristic: Optional[Callable] = None, workers: Optional[int] = None,
+             time_limit_sec: float = 60.0, batch_size: int = 64) -> Tuple[Optional[List], Optional[float], _Metrics]:
+    """Hash-distributed A*: states are partitioned over worker processes by owner(code).
+       - each worker runs A* on its own states; successors go to their owner in batched queue messages
+       - a goal only sets the shared incumbent cost; search goes on until nothing below it is left
+       - termination: every worker idle and sent == received, seen unchanged by two consecutive polls
+       - the plan is traced back through the owners of each parent
+       heuristic must be picklable (a module-level function) and admissible for an optimal plan.
+       expanded counts generated nodes over all workers, max_fringe sums the workers' largest open lists."""
+    start_t = time.perf_counter()
+    P = workers or os.cpu_count() or 1
+    M = _Metrics()
+    h = heuristic or _zero
+    start = problem.initial_state()
+    if problem.is_goal(start):
+        return [], 0.0, M
+
+    inboxes = [mp.Queue() for _ in range(P)]
+    results = mp.Queue()
+    sent = mp.Array("q", P + 1, lock=False)   # slot P: the coordinator
+    recv = mp.Array("q", P, lock=False)
+    idle = mp.Array("b", P, lock=False)
+    incumbent = mp.Value("d", INF)
+    goal_code = mp.Value("q", NO_PARENT)
+    procs = [mp.Process(target=_worker, args=(w, problem, h, inboxes, results, sent, recv, idle,
+                                              incumbent, goal_code, batch_size), daemon=True)
+             for w in range(P)]
+    for p in procs:
+        p.start()
+
+    code0 = encode(start)
+    sent[P] += 1
+    inboxes[owner(code0, P)].put(("batch", [(code0, 0.0, NO_PARENT, 0)]))
+
+    last = None
+    timed_out = False
+    while True:
+        if (time.perf_counter() - start_t) > time_limit_sec:
+            timed_out = True
+            break
+        time.sleep(0.002)
+        snap = (all(idle[:]), sum(sent[:]), sum(recv[:]))
+        if snap[0] and snap[1] == snap[2] and snap == last:
+            break
+        last = snap
+
+    actions = None
+    if not timed_out and goal_code.value != NO_PARENT:
+        actions = []
+        code = goal_code.value
+        while code != code0:
+            inboxes[owner(code, P)].put(("trace", code))
+            _, code, acode = results.get()
+            actions.append(ACTIONS[acode])
+        actions.reverse()
+
+    for box in inboxes:
+        box.put(("stop",))
+    for _ in range(P):
+        msg = results.get()
+        M.expanded += msg[1]
+        M.max_fringe += msg[2]
+    for p in procs:
+        p.join()
+    M.time_ms = (time.perf_counter() - start_t) * 1000
+    if actions is None:
+        return None, None, M
+    return actions, incumbent.value, M
+
+
+def _zero(s) -> float:
+    return 0.0
+
+
+if __name__ == "__main__":
+    #quick test for this file
+    from task1.requirement_4 import astar, scramble_from_goal
+    from task1.pattern_db import h_pdb_max
+
+    for k in (10, 20, 40):
+        s = scramble_from_goal(k, seed=7)
+        ref = astar(PuzzleProblem(s), heuristic_override=h_pdb_max)
+        for P in (1, 2, 4):
+            acts, cost, m = hda_star(PuzzleProblem(s), h_pdb_max, workers=P)
+            print(f"k={k:2d} workers={P} cost={cost} (astar {ref[1]}) expanded={m.expanded} time_ms={m.time_ms:.1f}")
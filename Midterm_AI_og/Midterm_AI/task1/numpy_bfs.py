@@ -0,0 +1,135 @@
+# task1/numpy_bfs.py
+# Layer-synchronous BFS over packed boards held in NumPy arrays (needs numpy)
+import time
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from task1.puzzle_rule import GOAL, SWAP_PAIRS, CORNER_PAIRS, SWAP_MASK, MOVE, SWAP9, SWAP_DIAG, ACTIONS, encode
+from task1.state_index import N_STATES
+from task1.requirement_4 import _Metrics
+
+UNREACHABLE = 255
+
+_SHIFTS = np.arange(0, 36, 4, dtype=np.uint64)
+_FACT = (40320, 5040, 720, 120, 24, 6, 2, 1)
+
+# Every (cells, action) a child can come from: MOVE and SWAP9 on adjacent pairs, SWAP_DIAG on corners
+_CANDIDATES = ([(i, j, MOVE) for i, j in SWAP_PAIRS] + [(i, j, SWAP9) for i, j in SWAP_PAIRS]
+               + [(i, j, SWAP_DIAG) for i, j in CORNER_PAIRS])
+
+
+def cells(codes: np.ndarray) -> np.ndarray:
+    """Packed boards (N,) uint64 -> (N, 9) tile values."""
+    return ((codes[:, None] >> _SHIFTS) & np.uint64(0xF)).astype(np.int8)
+
+
+def ranks(board: np.ndarray) -> np.ndarray:
+    """Lehmer rank of every row of an (N, 9) board array, same as state_index.rank."""
+    r = np.zeros(len(board), dtype=np.int64)
+    for i, w in enumerate(_FACT):
+        r += (board[:, i + 1:] < board[:, i:i + 1]).sum(axis=1) * w
+    return r
+
+
+def expand(codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """All children of a layer: (child codes, index of the parent in codes, action code).
+    A candidate (i, j) is legal when its mask holds; the child is code ^ ((a ^ b) * SWAP_MASK[i, j])."""
+    board = cells(codes)
+    kids, parents, actions = [], [], []
+    for i, j, kind in _CANDIDATES:
+        a, b = board[:, i], board[:, j]
+        if kind == MOVE:
+            ok = (a == 0) | (b == 0)
+        elif kind == SWAP9:
+            ok = (a + b) == 9
+        else:
+            ok = (a != 0) & (b != 0)
+        idx = np.nonzero(ok)[0]
+        d = (a[idx] ^ b[idx]).astype(np.uint64)
+        kids.append(codes[idx] ^ (d * np.uint64(SWAP_MASK[(i, j)])))
+        parents.append(idx.astype(np.int32))
+        actions.append(np.full(len(idx), kind, dtype=np.uint8))
+    return np.concatenate(kids), np.concatenate(parents), np.concatenate(actions)
+
+
+def _next_layer(layer: np.ndarray, visited: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Children of layer not yet visited, one per state (np.unique on ranks); marks them visited."""
+    kids, parents, actions = expand(layer)
+    r = ranks(cells(kids))
+    fresh = ~visited[r]
+    r, first = np.unique(r[fresh], return_index=True)
+    visited[r] = True
+    return kids[fresh][first], parents[fresh][first], actions[fresh][first]
+
+
+def numpy_bfs(problem, time_limit_sec: float = 10.0,
+              goal: Optional[Tuple[int, ...]] = None) -> Tuple[Optional[List], Optional[float], _Metrics]:
+    """BFS one whole layer at a time (unit costs, so depth == cost).
+       Only the current layer's codes are kept; earlier layers keep just (parent index, action)
+       per state, enough to walk the plan back from goal (default: any of problem.goals)."""
+    start_t = time.perf_counter()
+    M = _Metrics()
+    start = problem.initial_state()
+    if problem.is_goal(start):
+        M.time_ms = (time.perf_counter() - start_t) * 1000
+        return [], 0.0, M
+
+    visited = np.zeros(N_STATES, dtype=bool)
+    layer = np.array([encode(start)], dtype=np.uint64)
+    visited[ranks(cells(layer))] = True
+    goals = [goal] if goal is not None else getattr(problem, "goals", (GOAL,))
+    goal_codes = np.array([encode(g) for g in goals], dtype=np.uint64)
+    back: List[Tuple[np.ndarray, np.ndarray]] = []
+
+    while len(layer):
+        if (time.perf_counter() - start_t) > time_limit_sec:
+            break
+        layer, parents, actions = _next_layer(layer, visited)
+        back.append((parents, actions))
+        M.expanded += len(layer)
+        M.max_fringe = max(M.max_fringe, len(layer))
+
+        hit = np.nonzero(np.isin(layer, goal_codes))[0]
+        if len(hit):
+            p = int(hit[0])
+            plan = []
+            for parents, actions in reversed(back):
+                plan.append(ACTIONS[actions[p]])
+                p = int(parents[p])
+            M.time_ms = (time.perf_counter() - start_t) * 1000
+            return list(reversed(plan)), float(len(plan)), M
+
+    M.time_ms = (time.perf_counter() - start_t) * 1000
+    return None, None, M
+
+
+def sweep(sources: Sequence[Tuple[int, ...]] = (GOAL,)) -> np.ndarray:
+    """Full-space BFS from the sources: depth of every rank (UNREACHABLE if never reached)."""
+    dist = np.full(N_STATES, UNREACHABLE, dtype=np.uint8)
+    visited = np.zeros(N_STATES, dtype=bool)
+    layer = np.unique(np.array([encode(s) for s in sources], dtype=np.uint64))
+    r = ranks(cells(layer))
+    visited[r] = True
+    dist[r] = 0
+    depth = 0
+    while len(layer):
+        depth += 1
+        layer, _, _ = _next_layer(layer, visited)
+        dist[ranks(cells(layer))] = depth
+    return dist
+
+
+if __name__ == "__main__":
+    #quick test for this file
+    from task1.oracle import get_table
+    from task1.puzzle_rule import PuzzleProblem
+    from task1.state_index import unrank
+
+    t0 = time.perf_counter()
+    dist = sweep()
+    print(f"Full sweep in {time.perf_counter() - t0:.2f}s, max depth {dist.max()}")
+    print("Matches oracle table:", bytes(dist) == bytes(get_table().data))
+    s = unrank(123456)
+    acts, cost, m = numpy_bfs(PuzzleProblem(s))
+    print(f"numpy_bfs cost={cost} (oracle {get_table().dist(s)}) expanded={m.expanded} time_ms={m.time_ms:.1f}")
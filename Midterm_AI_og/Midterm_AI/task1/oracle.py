@@ -0,0 +1,172 @@
+# task1/oracle.py
+# Perfect oracle: exact cost to the nearest goal of every state, one byte per permutation rank
+import mmap
+import os
+import time
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+from task1.puzzle_rule import PuzzleProblem, GOAL, encode
+from task1.state_index import N_STATES, rank, rank_packed
+from task1.requirement_2 import GOALS
+from task1.requirement_4 import _Metrics
+
+UNREACHABLE = 255
+TABLE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PATH = os.path.join(TABLE_DIR, "oracle_distances.bin")
+
+
+def reverse_bfs(sources: Iterable[Tuple[int, ...]], nearest: Optional[bytearray] = None) -> bytearray:
+    """Layered BFS from the sources over the whole state space.
+    Every operator (MOVE, SWAP9, SWAP_DIAG) is its own inverse and costs 1,
+    so the forward BFS depth from a source is the cost of reaching it.
+    All sources are seeded into layer 0, so one sweep gives the distance to the nearest of them;
+    nearest (N_STATES bytes, optional) receives the index in sources of that nearest source."""
+    dist = bytearray([UNREACHABLE]) * N_STATES
+    succ = PuzzleProblem(GOAL).successors_packed
+    layer = []
+    for k, s in enumerate(sources):
+        code = encode(s)
+        r = rank_packed(code)
+        if dist[r] != 0:
+            dist[r] = 0
+            layer.append(code)
+            if nearest is not None:
+                nearest[r] = k
+
+    depth = 0
+    while layer:
+        depth += 1
+        if depth >= UNREACHABLE:
+            raise ValueError("Depth does not fit in one byte")
+        nxt = []
+        for code in layer:
+            src = nearest[rank_packed(code)] if nearest is not None else 0
+            for _, c2, _ in succ(code):
+                r2 = rank_packed(c2)
+                if dist[r2] == UNREACHABLE:
+                    dist[r2] = depth
+                    nxt.append(c2)
+                    if nearest is not None:
+                        nearest[r2] = src
+        layer = nxt
+    return dist
+
+
+def open_table(path: str, size: int, build: Callable[[], bytearray]) -> mmap.mmap:
+    """Map a byte table read-only, building and writing it first if missing or stale."""
+    if not os.path.exists(path) or os.path.getsize(path) != size:
+        data = build()
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def goals_path(goals: Iterable[Tuple[int, ...]], suffix: str = "") -> str:
+    """Table file for a goal set, named by its sorted ranks (GOAL alone keeps DEFAULT_PATH)."""
+    key = sorted({rank(g) for g in goals})
+    if key == [rank(GOAL)] and not suffix:
+        return DEFAULT_PATH
+    return os.path.join(TABLE_DIR, "oracle_goals_%s%s.bin" % ("_".join(map(str, key)), suffix))
+
+
+class DistanceTable:
+    """Exact distance to the nearest of goals for every state, backed by an mmap'ed file.
+    The table comes from one multi-source reverse_bfs over all goals; nearest_goal() maps a
+    second byte table (index of the closest goal) the first time it is asked for."""
+    def __init__(self, path: Optional[str] = None, goals: Sequence[Tuple[int, ...]] = (GOAL,)):
+        self.goals = tuple(sorted({tuple(g) for g in goals}, key=rank))
+        self.path = path or goals_path(self.goals)
+        self.data = open_table(self.path, N_STATES, lambda: reverse_bfs(self.goals))
+        self.nearest: Optional[mmap.mmap] = None
+
+    def dist(self, state: Tuple[int, ...]) -> int:
+        return self.data[rank(state)]
+
+    def _build_nearest(self) -> bytearray:
+        nearest = bytearray(N_STATES)
+        reverse_bfs(self.goals, nearest)
+        return nearest
+
+    def nearest_goal(self, state: Tuple[int, ...]) -> Tuple[Tuple[int, ...], int]:
+        """(closest goal, its distance): one rank and two byte lookups."""
+        if self.nearest is None:
+            self.nearest = open_table(goals_path(self.goals, "_nearest"), N_STATES, self._build_nearest)
+        r = rank(state)
+        return self.goals[self.nearest[r]], self.data[r]
+
+    def close(self):
+        self.data.close()
+        if self.nearest is not None:
+            self.nearest.close()
+
+
+_TABLES: Dict[FrozenSet[Tuple[int, ...]], DistanceTable] = {}
+
+def get_table(goals: Sequence[Tuple[int, ...]] = (GOAL,)) -> DistanceTable:
+    """Shared table per goal set (get_table(GOALS) for the four accepted goals)."""
+    key = frozenset(tuple(g) for g in goals)
+    if key not in _TABLES:
+        _TABLES[key] = DistanceTable(goals=key)
+    return _TABLES[key]
+
+
+def h_exact(state: Tuple[int, ...]) -> float:
+    """Perfect heuristic (true optimal cost). Admissible & Consistent."""
+    return float(get_table().dist(state))
+
+
+def h_exact_goals(state: Tuple[int, ...]) -> float:
+    """Perfect heuristic towards the nearest of GOALS: one lookup instead of a scan per goal."""
+    return float(get_table(GOALS).data[rank(state)])
+
+
+def oracle_solve(start: Tuple[int, ...], goals: Sequence[Tuple[int, ...]] = (GOAL,)
+                 ) -> Tuple[Optional[List], Optional[float], _Metrics]:
+    """Optimal plan in O(depth): from each state step to any successor one closer to the goal set."""
+    start_t = time.perf_counter()
+    M = _Metrics()
+    table = get_table(goals).data
+    problem = PuzzleProblem(start, goals)
+
+    s = problem.initial_state()
+    d = table[rank(s)]
+    if d == UNREACHABLE:
+        M.time_ms = (time.perf_counter() - start_t) * 1000
+        return None, None, M
+
+    actions = []
+    while d > 0:
+        for action, s2, _ in problem.successors(s):
+            if table[rank(s2)] == d - 1:
+                actions.append(action)
+                s, d = s2, d - 1
+                break
+        M.expanded += 1
+    M.time_ms = (time.perf_counter() - start_t) * 1000
+    return actions, float(len(actions)), M
+
+
+if __name__ == "__main__":
+    #quick test for this file
+    t0 = time.perf_counter()
+    table = get_table()
+    print(f"Table ready in {time.perf_counter() - t0:.2f}s: {table.path}")
+    depths = {}
+    for d in table.data[:]:
+        depths[d] = depths.get(d, 0) + 1
+    print("States per depth:", dict(sorted(depths.items())))
+    start = (8, 2, 3, 4, 5, 6, 7, 0, 1)
+    print("h_exact =", h_exact(start), "plan =", oracle_solve(start)[:2])
+
+    t0 = time.perf_counter()
+    multi = get_table(GOALS)
+    goal, d = multi.nearest_goal(start)
+    print(f"GOALS table ready in {time.perf_counter() - t0:.2f}s: nearest goal {goal} at {d}, "
+          f"plan = {oracle_solve(start, GOALS)[:2]}")
+    assert all(multi.data[r] == min(get_table([g]).data[r] for g in GOALS) for r in range(0, N_STATES, 997))
+    assert all(get_table([g]).data[r] == multi.data[r] for r in range(0, N_STATES, 997)
+               for g in [multi.goals[multi.nearest[r]]])
+    print("Multi-source table == min over per-goal tables, nearest_goal consistent")
@@ -0,0 +1,189 @@
+# task1/parallel_astar.py
+# Thread-parallel A* for free-threaded CPython (3.13t); runs on one thread under the GIL
+import heapq
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+from task1.puzzle_rule import PuzzleProblem, encode, decode
+from task1.hda_star import owner
+from task1.requirement_4 import _Metrics
+
+INF = float("inf")
+NO_PARENT = -1
+
+
+def free_threaded() -> bool:
+    """True on a free-threaded build with the GIL actually disabled."""
+    return not getattr(sys, "_is_gil_enabled", lambda: True)()
+
+
+class StripedTable:
+    """Shared best-g / parent table split into lock-protected stripes by owner(code)."""
+    def __init__(self, stripes: int = 64):
+        self.stripes = stripes
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._tables: List[Dict[int, Tuple[float, int, str]]] = [{} for _ in range(stripes)]
+
+    def improve(self, code: int, g: float, parent: int, action: str) -> bool:
+        """Record (g, parent, action) if g beats the stored one; True when it did."""
+        i = owner(code, self.stripes)
+        t = self._tables[i]
+        with self._locks[i]:
+            old = t.get(code)
+            if old is None or g < old[0]:
+                t[code] = (g, parent, action)
+                return True
+        return False
+
+    def g(self, code: int) -> float:
+        entry = self._tables[owner(code, self.stripes)].get(code)
+        return entry[0] if entry else INF
+
+    def path(self, code: int) -> List:
+        acts = []
+        while True:
+            _, parent, action = self._tables[owner(code, self.stripes)][code]
+            if parent == NO_PARENT:
+                return list(reversed(acts))
+            acts.append(action)
+            code = parent
+
+    def __len__(self) -> int:
+        return sum(len(t) for t in self._tables)
+
+
+class _Worker:
+    """Per-thread state: own open heap, an inbox other threads append to, message counters."""
+    def __init__(self):
+        self.open: List[Tuple[float, int, float, int]] = []
+        self.inbox: deque = deque()
+        self.sent = 0
+        self.recv = 0
+        self.idle = False
+        self.expanded = 0
+        self.max_open = 0
+
+
+def parallel_astar(problem: PuzzleProblem, heuristic: Optional[Callable] = None, threads: Optional[int] = None,
+                   time_limit_sec: float = 10.0, stripes: int = 64,
+                   batch_size: int = 32) -> Tuple[Optional[List], Optional[float], _Metrics]:
+    """K-thread A* sharing one closed set (StripedTable), one open list per thread.
+       - a successor whose g improves the shared table is sent to the inbox of owner(code, K)
+       - a goal sets the shared incumbent; threads only expand nodes with f below it
+       - done when every thread is idle and sent == received over two consecutive polls
+       threads defaults to os.cpu_count() on a free-threaded build and to 1 under the GIL,
+       where extra threads would only take turns; threads=1 runs in the calling thread.
+       expanded counts generated nodes, max_fringe sums the threads' largest open lists."""
+    start_t = time.perf_counter()
+    K = threads or ((os.cpu_count() or 1) if free_threaded() else 1)
+    h = heuristic or (lambda s: 0.0)
+    M = _Metrics()
+    start = problem.initial_state()
+    if problem.is_goal(start):
+        return [], 0.0, M
+
+    table = StripedTable(stripes)
+    workers = [_Worker() for _ in range(K)]
+    inc_lock = threading.Lock()
+    incumbent = [INF, NO_PARENT]  # cost, goal code
+    stop = threading.Event()
+    counter = itertools.count(1)
+
+    def step(w: _Worker, wid: int) -> int:
+        """Drain the inbox, expand up to batch_size nodes; returns how many were expanded."""
+        inbox, openh = w.inbox, w.open
+        if inbox:
+            w.idle = False
+        while inbox:
+            item = inbox.popleft()
+            w.recv += 1
+            heapq.heappush(openh, item)
+        n = 0
+        while openh and n < batch_size:
+            f, _, g1, code = openh[0]
+            if f >= incumbent[0]:
+                break
+            heapq.heappop(openh)
+            if g1 != table.g(code):
+                continue
+            n += 1
+            if problem.is_goal(decode(code)):
+                with inc_lock:
+                    if g1 < incumbent[0]:
+                        incumbent[0], incumbent[1] = g1, code
+                continue
+            for action, c2, cost in problem.successors_packed(code):
+                w.expanded += 1
+                g2 = g1 + cost
+                if table.improve(c2, g2, code, action):
+                    item = (g2 + h(decode(c2)), next(counter), g2, c2)
+                    dest = owner(c2, K)
+                    if dest == wid:
+                        heapq.heappush(openh, item)
+                    else:
+                        w.sent += 1
+                        workers[dest].inbox.append(item)
+        w.max_open = max(w.max_open, len(openh))
+        return n
+
+    def run(wid: int):
+        w = workers[wid]
+        while not stop.is_set():
+            if not step(w, wid):
+                w.idle = True
+                time.sleep(0.0002)
+
+    code0 = encode(start)
+    table.improve(code0, 0.0, NO_PARENT, None)
+    workers[owner(code0, K)].open.append((h(start), 0, 0.0, code0))
+
+    timed_out = False
+    if K == 1:
+        w = workers[0]
+        while step(w, 0):
+            if (time.perf_counter() - start_t) > time_limit_sec:
+                timed_out = True
+                break
+    else:
+        pool = [threading.Thread(target=run, args=(i,), daemon=True) for i in range(K)]
+        for t in pool:
+            t.start()
+        last = None
+        while True:
+            if (time.perf_counter() - start_t) > time_limit_sec:
+                timed_out = True
+                break
+            time.sleep(0.001)
+            snap = (all(w.idle for w in workers), sum(w.sent for w in workers), sum(w.recv for w in workers))
+            if snap[0] and snap[1] == snap[2] and snap == last:
+                break
+            last = snap
+        stop.set()
+        for t in pool:
+            t.join()
+
+    M.expanded = sum(w.expanded for w in workers)
+    M.max_fringe = sum(w.max_open for w in workers)
+    M.time_ms = (time.perf_counter() - start_t) * 1000
+    if timed_out or incumbent[1] == NO_PARENT:
+        return None, None, M
+    return table.path(incumbent[1]), incumbent[0], M
+
+
+if __name__ == "__main__":
+    #quick test for this file
+    from task1.requirement_4 import astar, scramble_from_goal
+    from task1.pattern_db import h_pdb_max
+
+    print("free-threaded:", free_threaded())
+    for k in (10, 20, 40):
+        s = scramble_from_goal(k, seed=11)
+        ref = astar(PuzzleProblem(s), heuristic_override=h_pdb_max)
+        for K in (None, 2, 4):
+            acts, cost, m = parallel_astar(PuzzleProblem(s), h_pdb_max, threads=K)
+            print(f"k={k:2d} threads={K} cost={cost} (astar {ref[1]}) expanded={m.expanded} time_ms={m.time_ms:.1f}")
@@ -0,0 +1,155 @@
+# task1/pattern_db.py
+# Pattern-database heuristics for the MOVE / SWAP9 / SWAP_DIAG rule set
+import os
+import time
+from typing import Dict, List, Sequence, Tuple
+
+from task1.puzzle_rule import GOAL, NEIGHBORS, CORNER_PAIRS, SWAP_PAIRS
+from task1.oracle import UNREACHABLE, open_table
+
+DONT_CARE = 15
+TABLE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Complementary pairs (A + B = 9) share a subset, so SWAP9 never crosses the partition
+ADDITIVE_PARTITION = ((1, 2, 7, 8), (3, 4, 5, 6))
+
+
+def _abstract_successors(board: Tuple[int, ...], pattern: frozenset, additive: bool):
+    """Abstract operators over boards where non-pattern tiles are DONT_CARE.
+    Costs: max PDB charges 1 per move. Additive PDB works in half-moves:
+    each real move is charged 2 split over the tiles it moves (blank is free),
+    so per real move the charges summed over a disjoint partition never exceed 2."""
+    t = list(board)
+    zero = t.index(0)
+
+    for j in NEIGHBORS[zero]:
+        u = t[:]
+        u[zero], u[j] = u[j], u[zero]
+        cost = 1 if not additive else (2 if t[j] in pattern else 0)
+        yield tuple(u), cost
+
+    #a DONT_CARE tile may be 9 - a unless 9 - a is itself a pattern tile
+    for i, j in SWAP_PAIRS:
+        a, b = t[i], t[j]
+        if a == 0 or b == 0 or (a == DONT_CARE and b == DONT_CARE):
+            continue
+        if a == DONT_CARE:
+            ok = (9 - b) not in pattern
+        elif b == DONT_CARE:
+            ok = (9 - a) not in pattern
+        else:
+            ok = a + b == 9
+        if ok:
+            u = t[:]
+            u[i], u[j] = u[j], u[i]
+            both = a != DONT_CARE and b != DONT_CARE
+            yield tuple(u), (1 if not additive else (2 if both else 1))
+
+    for i, j in CORNER_PAIRS:
+        a, b = t[i], t[j]
+        if a == 0 or b == 0 or (a == DONT_CARE and b == DONT_CARE):
+            continue
+        u = t[:]
+        u[i], u[j] = u[j], u[i]
+        both = a != DONT_CARE and b != DONT_CARE
+        yield tuple(u), (1 if not additive else (2 if both else 1))
+
+
+class PatternDB:
+    """Exact abstract distances to GOAL for the blank plus a subset of tiles.
+    Indexed by the (blank, tile...) positions as a partial-permutation rank;
+    stored one byte per entry and mmap'ed from TABLE_DIR."""
+    def __init__(self, tiles: Sequence[int], additive: bool = False):
+        self.tiles = tuple(tiles)
+        self.additive = additive
+        self.k = len(self.tiles) + 1
+        self.weights = []
+        w = 1
+        for i in reversed(range(self.k)):
+            self.weights.append(w)
+            w *= 9 - i
+        self.weights.reverse()
+        self.size = w
+        name = "pdb_%s_%s.bin" % ("".join(map(str, self.tiles)), "add" if additive else "max")
+        self.path = os.path.join(TABLE_DIR, name)
+        self.data = open_table(self.path, self.size, self._build)
+
+    def _index(self, positions: Sequence[int]) -> int:
+        idx = 0
+        used = 0
+        for p, w in zip(positions, self.weights):
+            idx += (p - bin(used & ((1 << p) - 1)).count("1")) * w
+            used |= 1 << p
+        return idx
+
+    def _board_index(self, board: Tuple[int, ...]) -> int:
+        return self._index([board.index(v) for v in (0,) + self.tiles])
+
+    def _build(self) -> bytearray:
+        # Dial's buckets: edge costs are 0, 1 or 2
+        pattern = frozenset(self.tiles)
+        dist = bytearray([UNREACHABLE]) * self.size
+        goal = tuple(v if v == 0 or v in pattern else DONT_CARE for v in GOAL)
+        dist[self._board_index(goal)] = 0
+        buckets: Dict[int, List[Tuple[int, ...]]] = {0: [goal]}
+        d = 0
+        while buckets:
+            bucket = buckets.get(d)
+            #zero-cost moves append to the bucket being drained
+            while bucket:
+                board = bucket.pop()
+                if dist[self._board_index(board)] != d:
+                    continue
+                for board2, cost in _abstract_successors(board, pattern, self.additive):
+                    i2 = self._board_index(board2)
+                    if d + cost < dist[i2]:
+                        dist[i2] = d + cost
+                        buckets.setdefault(d + cost, []).append(board2)
+            buckets.pop(d, None)
+            d += 1
+        return dist
+
+    def lookup(self, state: Tuple[int, ...]) -> int:
+        pos = [0] * 9
+        for i, v in enumerate(state):
+            pos[v] = i
+        return self.data[self._index([pos[v] for v in (0,) + self.tiles])]
+
+
+_DBS: Dict[Tuple[Tuple[int, ...], bool], PatternDB] = {}
+
+def get_pdb(tiles: Sequence[int], additive: bool) -> PatternDB:
+    key = (tuple(tiles), additive)
+    if key not in _DBS:
+        _DBS[key] = PatternDB(tiles, additive)
+    return _DBS[key]
+
+
+def h_pdb_additive(state: Tuple[int, ...]) -> float:
+    """Disjoint additive PDBs over ADDITIVE_PARTITION (half-move units, rounded up). Admissible."""
+    half = sum(get_pdb(tiles, True).lookup(state) for tiles in ADDITIVE_PARTITION)
+    return float((half + 1) // 2)
+
+
+def h_pdb_max(state: Tuple[int, ...]) -> float:
+    """Max of the additive PDB sum and each subset's full-cost PDB. Admissible."""
+    return max(h_pdb_additive(state),
+               *(float(get_pdb(tiles, False).lookup(state)) for tiles in ADDITIVE_PARTITION))
+
+
+if __name__ == "__main__":
+    #quick test for this file
+    from task1.puzzle_rule import PuzzleProblem
+    from task1.requirement_2 import h1_misplaced_swap_adjust
+    from task1.requirement_4 import astar, scramble_from_goal
+
+    t0 = time.perf_counter()
+    for tiles in ADDITIVE_PARTITION:
+        get_pdb(tiles, True), get_pdb(tiles, False)
+    print(f"PDBs ready in {time.perf_counter() - t0:.2f}s")
+
+    for k in (10, 20, 30):
+        s = scramble_from_goal(k, seed=1)
+        for name, hfun in [("H1", h1_misplaced_swap_adjust), ("PDB+", h_pdb_additive), ("PDBmax", h_pdb_max)]:
+            acts, cost, m = astar(PuzzleProblem(s), heuristic_override=hfun, time_limit_sec=30.0)
+            print(f"k={k:2d} {name:6s} cost={cost} expanded={m.expanded} time_ms={m.time_ms:.1f}")
@@ -0,0 +1,140 @@
+# task1/portfolio.py
+# Portfolio solver: race several search strategies in worker processes, keep the first optimal plan
+import multiprocessing as mp
+import queue
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from task1.puzzle_rule import PuzzleProblem
+from task1.requirement_2 import h0_zero, h1_misplaced_swap_adjust
+from task1.requirement_4 import astar, ara_star, _Metrics
+from task1.requirement_8 import bfs
+from task1.bidirectional import bidirectional_bfs, bidirectional_astar
+from task1.pattern_db import h_pdb_max
+
+INF = float("inf")
+Result = Tuple[Optional[List], Optional[float], _Metrics]
+
+
+# Each strategy yields (actions, cost, metrics) one or more times; metrics.bound == 1.0 marks a
+# proven optimal plan, larger bounds a plan within that factor, inf a plan with no guarantee.
+def _astar_h0(problem: PuzzleProblem, time_limit_sec: float) -> Iterable[Result]:
+    yield astar(problem, heuristic_override=h0_zero, time_limit_sec=time_limit_sec)
+
+
+def _astar_h1(problem: PuzzleProblem, time_limit_sec: float) -> Iterable[Result]:
+    # H1 can overestimate, so its plans are not proven optimal
+    actions, cost, M = astar(problem, heuristic_override=h1_misplaced_swap_adjust, time_limit_sec=time_limit_sec)
+    M.bound = INF
+    yield actions, cost, M
+
+
+def _astar_pdb(problem: PuzzleProblem, time_limit_sec: float) -> Iterable[Result]:
+    yield astar(problem, heuristic_override=h_pdb_max, time_limit_sec=time_limit_sec)
+
+
+def _bfs(problem: PuzzleProblem, time_limit_sec: float) -> Iterable[Result]:
+    yield bfs(problem, time_limit_sec)
+
+
+def _bibfs(problem: PuzzleProblem, time_limit_sec: float) -> Iterable[Result]:
+    yield bidirectional_bfs(problem, time_limit_sec=time_limit_sec)
+
+
+def _mm_pdb(problem: PuzzleProblem, time_limit_sec: float) -> Iterable[Result]:
+    yield bidirectional_astar(problem, h_pdb_max, time_limit_sec=time_limit_sec)
+
+
+def _ara_pdb(problem: PuzzleProblem, time_limit_sec: float) -> Iterable[Result]:
+    yield from ara_star(problem, h_pdb_max, weight=3.0, time_limit_sec=time_limit_sec)
+
+
+STRATEGIES: Dict[str, Callable[[PuzzleProblem, float], Iterable[Result]]] = {
+    "A* H0": _astar_h0,
+    "A* H1": _astar_h1,
+    "A* PDB": _astar_pdb,
+    "BFS": _bfs,
+    "BiBFS": _bibfs,
+    "MM PDB": _mm_pdb,
+    "ARA* PDB": _ara_pdb,
+}
+DEFAULT_PORTFOLIO = ("A* H1", "BiBFS", "A* PDB", "ARA* PDB")
+
+
+def _run(name: str, start: Tuple[int, ...], time_limit_sec: float, out):
+    for actions, cost, M in STRATEGIES[name](PuzzleProblem(start), time_limit_sec):
+        if actions is not None:
+            out.put(("result", name, actions, cost, M))
+    out.put(("done", name))
+
+
+def _better(a: Tuple, b: Optional[Tuple]) -> bool:
+    """Smaller bound first, then cheaper plan (a, b are (name, actions, cost, M))."""
+    return b is None or (a[3].bound, a[2]) < (b[3].bound, b[2])
+
+
+def portfolio_solve(start: Tuple[int, ...], strategies: Sequence[str] = DEFAULT_PORTFOLIO,
+                    deadline: float = 10.0) -> Tuple[Optional[List], Optional[float], _Metrics, Optional[str]]:
+    """Run the named STRATEGIES in parallel processes on the same start state.
+       - returns as soon as one of them reports a proven optimal plan (metrics.bound == 1.0)
+       - otherwise, once all have finished or deadline seconds have passed, the plan with the
+         smallest bound (then lowest cost) reported so far
+       - every still-running strategy is terminated before returning
+       Returns (actions, cost, metrics of the winning run, strategy name); if nothing was found the
+       rest is None and metrics.bound is inf."""
+    for name in strategies:
+        if name not in STRATEGIES:
+            raise ValueError("Unknown strategy")
+    start_t = time.perf_counter()
+    out = mp.Queue()
+    procs = {name: mp.Process(target=_run, args=(name, start, deadline, out), daemon=True)
+             for name in strategies}
+    for p in procs.values():
+        p.start()
+
+    best = None
+    running = set(strategies)
+    try:
+        while running:
+            left = deadline - (time.perf_counter() - start_t)
+            if left <= 0:
+                break
+            try:
+                msg = out.get(timeout=left)
+            except queue.Empty:
+                break
+            if msg[0] == "done":
+                running.discard(msg[1])
+                continue
+            res = msg[1:]
+            if _better(res, best):
+                best = res
+            if best[3].bound <= 1.0:
+                break
+    finally:
+        for p in procs.values():
+            if p.is_alive():
+                p.terminate()
+        for p in procs.values():
+            p.join()
+
+    if best is None:
+        M = _Metrics(bound=INF)
+        M.time_ms = (time.perf_counter() - start_t) * 1000
+        return None, None, M, None
+    name, actions, cost, M = best
+    return actions, cost, M, name
+
+
+if __name__ == "__main__":
+    #quick test for this file
+    from task1.requirement_4 import scramble_from_goal
+
+    for k in (10, 20, 40):
+        s = scramble_from_goal(k, seed=2)
+        t0 = time.perf_counter()
+        acts, cost, m, name = portfolio_solve(s, deadline=10.0)
+        print(f"k={k:2d} winner={name} cost={cost} bound={m.bound} "
+              f"wall_ms={(time.perf_counter() - t0) * 1000:.1f}")
+    acts, cost, m, name = portfolio_solve(scramble_from_goal(40, seed=2), ("A* H0", "A* H1"), deadline=0.5)
+    print(f"deadline 0.5s: winner={name} cost={cost} bound={m.bound}")
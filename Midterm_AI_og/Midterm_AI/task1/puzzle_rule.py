@@ -10,20 +10,61 @@ NEIGHBORS = {
 
 CORNER_PAIRS = [(0, 8), (2, 6)]
 
+# Bit-packed boards: cell i lives in bits 4*i..4*i+3 of a 36-bit int.
+# Swapping cells i, j is code ^ (d * mask) with d = nibble_i ^ nibble_j and
+# mask = (1 << 4*i) | (1 << 4*j), so every successor is one xor on the parent.
+SWAP_PAIRS = [(i, j) for i in range(9) for j in NEIGHBORS[i] if j > i]
+SWAP_MASK = {(i, j): (1 << 4 * i) | (1 << 4 * j) for i in range(9) for j in range(9) if i != j}
+
+_MOVE_TABLE = [[(4 * j, SWAP_MASK[(z, j)]) for j in NEIGHBORS[z]] for z in range(9)]
+_SWAP9_TABLE = [(4 * i, 4 * j, SWAP_MASK[(i, j)]) for i, j in SWAP_PAIRS]
+_DIAG_TABLE = [(4 * i, 4 * j, SWAP_MASK[(i, j)]) for i, j in CORNER_PAIRS]
+_PAIR_MASK = [[SWAP_MASK.get((i, j), 0) for j in range(9)] for i in range(9)]
+
+# Action codes used by move descriptors (index into ACTIONS)
+ACTIONS = ("MOVE", "SWAP9", "SWAP_DIAG")
+MOVE, SWAP9, SWAP_DIAG = range(3)
+
+def encode(s: Tuple[int, ...]) -> int:
+    """Tuple board -> packed int."""
+    code = 0
+    for i, v in enumerate(s):
+        code |= v << (4 * i)
+    return code
+
+def decode(code: int) -> Tuple[int, ...]:
+    """Packed int -> tuple board."""
+    return tuple((code >> (4 * i)) & 0xF for i in range(9))
+
+_LOW_BITS = 0x111111111
+
+def blank_pos(code: int) -> int:
+    """Index of the 0 nibble: fold each nibble onto its low bit, the missing one is the blank."""
+    missing = _LOW_BITS ^ ((code | code >> 1 | code >> 2 | code >> 3) & _LOW_BITS)
+    if not missing:
+        raise ValueError("Board has no blank")
+    return (missing.bit_length() - 1) >> 2
+
+GOAL_CODE = encode(GOAL)
+
 class PuzzleProblem:
     """rule:
        - MOVE: move empty square in 4 directions (cost=1)
        - SWAP9: two adjacent squares with A+B=9 can swap(cost=1)
        - SWAP_DIAG: two diagonal corner squares TL↔BR, TR↔BL (no 0) (cost=1)
+       goals: accepted goal boards (default only GOAL, e.g. requirement_2.GOALS for all four);
+       is_goal is one lookup in goal_set.
     """
-    def __init__(self, start: Tuple[int, ...]):
+    def __init__(self, start: Tuple[int, ...], goals: Iterable[Tuple[int, ...]] = (GOAL,)):
         self.start = tuple(start)
+        self.goals = tuple(dict.fromkeys(tuple(g) for g in goals))
+        self.goal_set = frozenset(self.goals)
 
     def initial_state(self) -> Tuple[int, ...]:
         return self.start
 
     def is_goal(self, s: Tuple[int, ...]) -> bool:
-        return tuple(s) == GOAL
+        return tuple(s) in self.goal_set
 
     def successors(self, s: Tuple[int, ...]) -> Iterable[Tuple[str, Tuple[int, ...], float]]:
         t = list(s)
@@ -56,6 +97,79 @@ class PuzzleProblem:
                 u[i], u[j] = u[j], u[i]
                 yield ("SWAP_DIAG", tuple(u), 1.0)
 
+    def successors_indexed(self, s: Tuple[int, ...]) -> Iterable[Tuple[str, Tuple[int, ...], float, int, int]]:
+        """Same successors, in the same order, plus the two cell indices (i, j) that were swapped."""
+        t = list(s)
+        zero = t.index(0)
+
+        for j in NEIGHBORS[zero]:
+            u = t[:]
+            u[zero], u[j] = u[j], u[zero]
+            yield ("MOVE", tuple(u), 1.0, zero, j)
+
+        for i, j in SWAP_PAIRS:
+            a, b = t[i], t[j]
+            if a + b == 9:
+                u = t[:]
+                u[i], u[j] = b, a
+                yield ("SWAP9", tuple(u), 1.0, i, j)
+
+        for i, j in CORNER_PAIRS:
+            if t[i] and t[j]:
+                u = t[:]
+                u[i], u[j] = u[j], u[i]
+                yield ("SWAP_DIAG", tuple(u), 1.0, i, j)
+
+    # Lazy protocol: describe moves first, build the child only when it is needed
+    def moves(self, s: Tuple[int, ...]) -> Iterable[Tuple[int, int, int, float]]:
+        """Move descriptors (action_code, i, j, cost) in successors() order; the child swaps cells i and j."""
+        zero = s.index(0)
+        for j in NEIGHBORS[zero]:
+            yield (MOVE, zero, j, 1.0)
+        for i, j in SWAP_PAIRS:
+            if s[i] + s[j] == 9:
+                yield (SWAP9, i, j, 1.0)
+        for i, j in CORNER_PAIRS:
+            if s[i] and s[j]:
+                yield (SWAP_DIAG, i, j, 1.0)
+
+    def key(self, s: Tuple[int, ...]) -> int:
+        return encode(s)
+
+    def from_key(self, key: int) -> Tuple[int, ...]:
+        return decode(key)
+
+    def child_key(self, key: int, i: int, j: int) -> int:
+        """key() of the child that swaps cells i and j, without building it."""
+        d = ((key >> (4 * i)) ^ (key >> (4 * j))) & 0xF
+        return key ^ (d * _PAIR_MASK[i][j])
+
+    def apply(self, s: Tuple[int, ...], i: int, j: int) -> Tuple[int, ...]:
+        """Materialize the child described by (i, j)."""
+        u = list(s)
+        u[i], u[j] = u[j], u[i]
+        return tuple(u)
+
+    def successors_packed(self, code: int) -> Iterable[Tuple[str, int, float]]:
+        """Same successors, in the same order, on packed boards (see encode/decode)."""
+        z = blank_pos(code)
+
+        for sj, mask in _MOVE_TABLE[z]:
+            yield ("MOVE", code ^ (((code >> sj) & 0xF) * mask), 1.0)
+
+        #a+b==9 already rules out the blank (tiles are at most 8)
+        for si, sj, mask in _SWAP9_TABLE:
+            a = (code >> si) & 0xF
+            b = (code >> sj) & 0xF
+            if a + b == 9:
+                yield ("SWAP9", code ^ ((a ^ b) * mask), 1.0)
+
+        for si, sj, mask in _DIAG_TABLE:
+            a = (code >> si) & 0xF
+            b = (code >> sj) & 0xF
+            if a and b:
+                yield ("SWAP_DIAG", code ^ ((a ^ b) * mask), 1.0)
+
 if __name__ == "__main__":
     #quick test for this file
     start = (1, 2, 3, 4, 5, 6, 7, 0, 8)
@@ -64,3 +178,7 @@ if __name__ == "__main__":
     print("Is goal?", prob.is_goal(start))
     for act, nxt, c in list(prob.successors(start))[:10]:
         print(f"{act:10s} -> {nxt}, cost={c}")
+    code = encode(start)
+    print(f"Packed: {code:#011x}, blank at {blank_pos(code)}")
+    for act, nxt, c in prob.successors_packed(code):
+        print(f"{act:10s} -> {nxt:#011x} {decode(nxt)}, cost={c}")
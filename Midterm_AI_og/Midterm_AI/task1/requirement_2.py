@@ -59,8 +59,112 @@ def h1_misplaced_swap_adjust(state: Tuple[int, ...]) -> float:
 
     return max(0, mis - pairs)
 
+# Pairs that earn the H1 bonus: adjacent (only when A + B = 9) or diagonal corners.
+# A pair counts when state[i] == g[j] and state[j] == g[i]; such 2-cycles never share
+# a cell, so the greedy 'used' set above never rejects one and the count is additive.
+_H1_PAIRS = [(i, j, True) for i in range(9) for j in NEI[i] if j > i] + [(i, j, False) for i, j in CORNER_PAIRS]
+
+# Per-goal counters packed into one int, goal k in bits 8k..8k+7:
+# _MIS_LANES[pos][v] = misplaced flags of value v at pos, _PAIR_LANES[p][a][b] = pair flags
+_MIS_LANES = [[sum((v != 0 and v != g[pos]) << (8 * k) for k, g in enumerate(GOALS)) for v in range(9)]
+              for pos in range(9)]
+_PAIR_LANES = [[[sum(bool(a and b and (not sum9 or a + b == 9) and b == g[i] and a == g[j]) << (8 * k)
+                      for k, g in enumerate(GOALS)) for b in range(9)] for a in range(9)]
+               for i, j, sum9 in _H1_PAIRS]
+_H1_AFFECTED = {(i, j): tuple((p, a, b) for p, (a, b, _) in enumerate(_H1_PAIRS) if {a, b} & {i, j})
+                for i in range(9) for j in range(9) if i != j}
+
+class IncrementalH1:
+    """h1_misplaced_swap_adjust maintained from parent deltas.
+    h-state = (state, misplaced per goal, swap pairs per goal), the per-goal counts packed
+    into 8-bit lanes of one int. A child differs from its parent in two cells, so h_delta
+    only re-reads those two cells and the few pairs touching them."""
+    def h_state(self, state: Tuple[int, ...]):
+        s = tuple(state)
+        mis = sum(_MIS_LANES[pos][v] for pos, v in enumerate(s))
+        pairs = sum(_PAIR_LANES[p][s[i]][s[j]] for p, (i, j, _) in enumerate(_H1_PAIRS))
+        return s, mis, pairs
+
+    def h_delta(self, parent_h_state, i: int, j: int):
+        s, mis, pairs = parent_h_state
+        a, b = s[i], s[j]
+        u = list(s)
+        u[i], u[j] = b, a
+        mis += _MIS_LANES[i][b] + _MIS_LANES[j][a] - _MIS_LANES[i][a] - _MIS_LANES[j][b]
+        for p, pi, pj in _H1_AFFECTED[(i, j)]:
+            pairs += _PAIR_LANES[p][u[pi]][u[pj]] - _PAIR_LANES[p][s[pi]][s[pj]]
+        return tuple(u), mis, pairs
+
+    def value(self, h_state) -> float:
+        _, mis, pairs = h_state
+        lanes = [(mis >> (8 * k)) & 0xFF for k in range(len(GOALS))]
+        k = lanes.index(min(lanes))
+        return max(0, lanes[k] - ((pairs >> (8 * k)) & 0xFF))
+
+    def __call__(self, state: Tuple[int, ...]) -> float:
+        return self.value(self.h_state(state))
+
+h1_incremental = IncrementalH1()
+
+# H2: per move a tile travels one edge of the cell graph (NEI for MOVE / SWAP9, CORNER_PAIRS for
+# SWAP_DIAG) and at most two tiles travel, so half the summed tile distances never overestimates.
+def _cell_distances(src: int) -> list:
+    dist = [None] * 9
+    dist[src] = 0
+    layer = [src]
+    while layer:
+        nxt = []
+        for p in layer:
+            for q in NEI[p] + [b for a, b in CORNER_PAIRS if a == p] + [a for a, b in CORNER_PAIRS if b == p]:
+                if dist[q] is None:
+                    dist[q] = dist[p] + 1
+                    nxt.append(q)
+        layer = nxt
+    return dist
+
+_CELL_DIST = [_cell_distances(p) for p in range(9)]
+# _TD_LANES[pos][v] = distance of tile v at pos to its cell in each goal (8-bit lanes as in H1);
+# _TD_SWAP[i][j][a][b] = change of the packed sums when a (at i) and b (at j) swap cells
+_TD_LANES = [[sum((_CELL_DIST[pos][g.index(v)] if v else 0) << (8 * k) for k, g in enumerate(GOALS))
+              for v in range(9)] for pos in range(9)]
+_TD_SWAP = [[[[_TD_LANES[i][b] + _TD_LANES[j][a] - _TD_LANES[i][a] - _TD_LANES[j][b]
+               for b in range(9)] for a in range(9)] for j in range(9)] for i in range(9)]
+
+class TileDistanceH:
+    """H2 = ceil(sum of tile cell distances / 2), minimum over GOALS. Admissible & Consistent.
+    h-state = (state, per-goal sums packed into 8-bit lanes). delta(h_state, i, j) is h(child) - h(node)
+    for the move swapping cells i and j from one _TD_SWAP lookup, without building the child
+    (the operator-selection table used by requirement_4.epea_star)."""
+    def h_state(self, state: Tuple[int, ...]):
+        s = tuple(state)
+        return s, sum(_TD_LANES[pos][v] for pos, v in enumerate(s))
+
+    def h_delta(self, parent_h_state, i: int, j: int):
+        s, sums = parent_h_state
+        a, b = s[i], s[j]
+        u = list(s)
+        u[i], u[j] = b, a
+        return tuple(u), sums + _TD_SWAP[i][j][a][b]
+
+    @staticmethod
+    def _h(sums: int) -> float:
+        return float((min((sums >> (8 * k)) & 0xFF for k in range(len(GOALS))) + 1) // 2)
+
+    def value(self, h_state) -> float:
+        return self._h(h_state[1])
+
+    def delta(self, h_state, i: int, j: int) -> float:
+        s, sums = h_state
+        return self._h(sums + _TD_SWAP[i][j][s[i]][s[j]]) - self._h(sums)
+
+    def __call__(self, state: Tuple[int, ...]) -> float:
+        return self.value(self.h_state(state))
+
+h2_tile_distance = TileDistanceH()
+
 if __name__ == "__main__":
     #quick test(only this one)
     s = (1,2,3,4,5,6,7,0,8)
     print("H0 =", h0_zero(s))
     print("H1 =", h1_misplaced_swap_adjust(s))
+    print("H2 =", h2_tile_distance(s))
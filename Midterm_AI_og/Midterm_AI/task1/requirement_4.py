@@ -1,86 +1,1024 @@
 # task1/Requirement_4.py
-import csv, random, statistics as st, time
-from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+import csv, os, pickle, random, statistics as st, time
+from array import array
+from collections import OrderedDict
+from dataclasses import astuple, dataclass, field, replace
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
 import heapq
 
-from task1.puzzle_rule import PuzzleProblem, GOAL as GOAL_RULE, NEIGHBORS as NEI_RULE
-from task1.requirement_2 import h0_zero, h1_misplaced_swap_adjust
+from task1.puzzle_rule import PuzzleProblem, ACTIONS, GOAL as GOAL_RULE, NEIGHBORS as NEI_RULE
+from task1.requirement_2 import h0_zero, h1_misplaced_swap_adjust, h2_tile_distance
+from task1.state_index import DenseStateIndex, rank, rank_packed, unrank
+from task1.bitstate import BitStateSet
 
 @dataclass(order=True)
 class _PQItem:
     priority: float
     count: int
     item: Any = field(compare=False)
+    g: float = field(default=0.0, compare=False)
 
 class _PriorityQueue:
     def __init__(self):
         self._h = []
         self._c = 0
-    def push(self, item, priority: float):
-        heapq.heappush(self._h, _PQItem(priority, self._c, item)); self._c += 1
+    def push(self, item, priority: float, g: float = 0.0):
+        heapq.heappush(self._h, _PQItem(priority, self._c, item, g)); self._c += 1
     def pop(self):
         return heapq.heappop(self._h).item
     def empty(self) -> bool:
         return not self._h
+    def accepts(self, priority: float) -> bool:
+        return True
+    def drain(self):
+        for it in self._h:
+            yield it.item, it.priority, it.g
+        self._h = []
+    def snapshot(self) -> Tuple:
+        """Entries in heap-array order with their insertion counters, so FIFO ties survive a reload."""
+        return ("heap", (self._c, array("q", (it.count for it in self._h))), array("i", (it.item for it in self._h)),
+                array("d", (it.priority for it in self._h)), array("d", (it.g for it in self._h)))
+    def restore(self, extra, nodes: array, prios: array, gs: array):
+        self._c, counts = extra
+        self._h = [_PQItem(p, c, n, g) for n, p, g, c in zip(nodes, prios, gs, counts)]
     def __len__(self): return len(self._h)
 
-@dataclass
-class _Node:
-    state: Any
-    g: float
-    action: Any
-    parent: "Optional[_Node]"
+class _BucketQueue:
+    """Dial's bucket queue for integer priorities: f -> g -> LIFO array of node handles (ints).
+    tie_break="deep" pops the largest g inside the lowest f bucket first, "shallow" the smallest.
+    A bucket holds at most f + 1 distinct g values, so pop is O(1) for small integer costs."""
+    def __init__(self, tie_break: str = "deep"):
+        if tie_break not in ("deep", "shallow"):
+            raise ValueError("Unknown tie_break")
+        self._b: Dict[int, Dict[int, array]] = {}
+        self._n = 0
+        self._min = 0
+        self._deep = tie_break == "deep"
+    def push(self, item, priority: float, g: float = 0.0):
+        f = int(priority)
+        bucket = self._b.get(f)
+        if bucket is None:
+            bucket = self._b[f] = {}
+        items = bucket.get(int(g))
+        if items is None:
+            items = bucket[int(g)] = array("i")
+        items.append(item)
+        if not self._n or f < self._min:
+            self._min = f
+        self._n += 1
+    def pop(self):
+        f = self._min
+        while f not in self._b:
+            f += 1
+        bucket = self._b[f]
+        g = max(bucket) if self._deep else min(bucket)
+        items = bucket[g]
+        item = items.pop()
+        if not items:
+            del bucket[g]
+            if not bucket:
+                del self._b[f]
+        self._n -= 1
+        self._min = f
+        return item
+    def empty(self) -> bool:
+        return not self._n
+    def accepts(self, priority: float) -> bool:
+        return float(priority).is_integer()
+    def drain(self):
+        yield from self._entries()
+        self._b, self._n = {}, 0
+    def _entries(self):
+        for f, bucket in self._b.items():
+            for g, items in bucket.items():
+                for item in items:
+                    yield item, f, g
+    def snapshot(self) -> Tuple:
+        """Entries in bucket order; pushing them back rebuilds every LIFO array as it was."""
+        nodes, prios, gs = array("i"), array("d"), array("d")
+        for item, f, g in self._entries():
+            nodes.append(item)
+            prios.append(f)
+            gs.append(g)
+        return ("bucket", None, nodes, prios, gs)
+    def restore(self, extra, nodes: array, prios: array, gs: array):
+        for n, p, g in zip(nodes, prios, gs):
+            self.push(n, p, g)
+    def __len__(self): return self._n
+
+class _RadixHeap:
+    """Radix heap for monotone integer priorities (non-unit costs, consistent h).
+    Bucket i holds keys whose highest bit differing from the last popped key is i - 1."""
+    def __init__(self):
+        self._b: List[List] = [[] for _ in range(65)]
+        self._last = 0
+        self._n = 0
+    def push(self, item, priority: float, g: float = 0.0):
+        k = int(priority)
+        self._b[(k ^ self._last).bit_length()].append((k, g, item))
+        self._n += 1
+    def pop(self):
+        if not self._b[0]:
+            i = 1
+            while not self._b[i]:
+                i += 1
+            moved = self._b[i]
+            self._b[i] = []
+            self._last = min(k for k, _, _ in moved)
+            for entry in moved:
+                self._b[(entry[0] ^ self._last).bit_length()].append(entry)
+        self._n -= 1
+        return self._b[0].pop()[2]
+    def empty(self) -> bool:
+        return not self._n
+    def accepts(self, priority: float) -> bool:
+        return float(priority).is_integer() and priority >= self._last
+    def drain(self):
+        for bucket in self._b:
+            for k, g, item in bucket:
+                yield item, k, g
+        self._b, self._n = [[] for _ in range(65)], 0
+    def snapshot(self) -> Tuple:
+        """Entries bucket by bucket plus the last popped key they are binned against."""
+        entries = [e for bucket in self._b for e in bucket]
+        return ("radix", self._last, array("i", (e[2] for e in entries)),
+                array("d", (e[0] for e in entries)), array("d", (e[1] for e in entries)))
+    def restore(self, extra, nodes: array, prios: array, gs: array):
+        self._last = extra
+        for n, p, g in zip(nodes, prios, gs):
+            self.push(n, p, g)
+    def __len__(self): return self._n
+
+def _make_queue(kind: str, tie_break: str = "deep"):
+    if kind in ("auto", "bucket"):
+        return _BucketQueue(tie_break)
+    elif kind == "radix":
+        return _RadixHeap()
+    elif kind == "heap":
+        return _PriorityQueue()
+    raise ValueError("Unknown queue")
+
+def _restore_queue(snap: Tuple, tie_break: str = "deep"):
+    """Inverse of queue.snapshot(): the same kind of queue with the same pop order."""
+    kind, extra, nodes, prios, gs = snap
+    openq = _make_queue(kind, tie_break)
+    openq.restore(extra, nodes, prios, gs)
+    return openq
+
+def _push(openq, item, priority: float, g: float):
+    """Push, falling back to the binary heap once a priority is not integral
+    (or, for the radix heap, not monotone). Returns the queue to keep using."""
+    if not openq.accepts(priority):
+        heap = _PriorityQueue()
+        for it, p, g0 in openq.drain():
+            heap.push(it, p, g0)
+        openq = heap
+    openq.push(item, priority, g)
+    return openq
+
+class _NodeArena:
+    """Search nodes as parallel array columns; a node is just its integer index.
+       - per node: state_id, g, parent (node index, -1 for the root), action (code)
+       - actions are interned once into action_names"""
+    def __init__(self):
+        self.state_id = array("i")
+        self.g = array("d")
+        self.parent = array("i")
+        self.action = array("i")
+        self.action_names: List[Any] = []
+        self._action_ids: Dict[Any, int] = {}
+
+    def add(self, sid: int, g: float, parent: int, action: Any) -> int:
+        code = self._action_ids.get(action)
+        if code is None:
+            code = self._action_ids[action] = len(self.action_names)
+            self.action_names.append(action)
+        self.state_id.append(sid)
+        self.g.append(g)
+        self.parent.append(parent)
+        self.action.append(code)
+        return len(self.g) - 1
+
+    def path(self, n: int) -> List:
+        acts = []
+        while self.parent[n] != -1:
+            acts.append(self.action_names[self.action[n]])
+            n = self.parent[n]
+        return list(reversed(acts))
+
+class _DictStore:
+    """Closed set for any hashable state: states interned to ids, best_g indexed by id.
+    With decode, sid() receives keys (e.g. packed ints) and state() decodes them back."""
+    def __init__(self, decode: Optional[Callable[[Hashable], Hashable]] = None):
+        self.decode = decode
+        self.states: List[Hashable] = []
+        self._ids: Dict[Hashable, int] = {}
+        self.g = array("d")
+
+    def sid(self, state: Hashable) -> int:
+        sid = self._ids.get(state)
+        if sid is None:
+            sid = self._ids[state] = len(self.states)
+            self.states.append(state)
+            self.g.append(float("inf"))
+        return sid
+
+    def state(self, sid: int) -> Hashable:
+        return self.decode(self.states[sid]) if self.decode else self.states[sid]
+
+    def close(self, sid: int, g: float):
+        self.g[sid] = g
+
+class _DenseStore:
+    """Closed set for 8-puzzle permutations: ids are ranks, nothing is stored per state.
+    Parents live in the node arena, so only the index's g / closed columns are allocated.
+    closed_ranks lists closed ranks in closing order, so checkpoints never scan all 9! flags.
+    With packed=True, sid() receives PuzzleProblem.key() ints instead of tuples."""
+    def __init__(self, packed: bool = False):
+        self.idx = DenseStateIndex(paths=False)
+        self.g = self.idx.g
+        self.closed_ranks = array("i")
+        self.sid = rank_packed if packed else rank
+
+    def state(self, sid: int) -> Tuple[int, ...]:
+        return unrank(sid)
+
+    def close(self, sid: int, g: float):
+        self.g[sid] = g
+        if not self.idx.closed[sid]:
+            self.idx.closed[sid] = 1
+            self.closed_ranks.append(sid)
+
+class _BitStore:
+    """Approximate closed set (bitstate hashing): a state is closed once it is in the BitStateSet.
+    Per-node states are only kept until they are closed; g[sid] reads -inf once the state is
+    closed, so duplicates are dropped, and inf before. sid 0 stands for every already-closed state.
+    No reopening: the first expansion of a state is final.
+    Only the closed set has a fixed size: states still grows by one slot per generated node
+    (set to None once closed), like the node arena and the open list."""
+    def __init__(self, bits: int, hashes: int, decode: Optional[Callable[[Hashable], Hashable]] = None):
+        self.filter = BitStateSet(bits, hashes)
+        self.decode = decode
+        self.states: List[Optional[Hashable]] = [None]
+        self.g = self
+
+    def __getitem__(self, sid: int) -> float:
+        s = self.states[sid]
+        return float("-inf") if s is None or s in self.filter else float("inf")
+
+    def sid(self, state: Hashable) -> int:
+        if state in self.filter:
+            return 0
+        self.states.append(state)
+        return len(self.states) - 1
+
+    def state(self, sid: int) -> Hashable:
+        return self.decode(self.states[sid]) if self.decode else self.states[sid]
+
+    def close(self, sid: int, g: float):
+        self.filter.add(self.states[sid])
+        self.states[sid] = None
+
+def _make_store(backend: str, problem: Any = None, keyed: bool = False,
+                bitstate_bits: int = 1 << 24, bitstate_hashes: int = 3):
+    if backend == "dict":
+        return _DictStore(problem.from_key if keyed else None)
+    elif backend == "dense":
+        return _DenseStore(packed=keyed)
+    elif backend == "bitstate":
+        return _BitStore(bitstate_bits, bitstate_hashes, problem.from_key if keyed else None)
+    raise ValueError("Unknown backend")
 
 @dataclass
 class _Metrics:
     expanded: int = 0
     max_fringe: int = 0
     time_ms: float = 0.0
+    bound: float = 1.0  # cost <= bound * optimal (for an admissible heuristic)
+    omission_prob: float = 0.0  # bitstate: chance that a new state was taken for a visited one
+    h_evals: List[int] = field(default_factory=list)  # lazy heuristics: calls per heuristic
+    h_time_ms: List[float] = field(default_factory=list)  # lazy heuristics: time spent per heuristic
+    max_nodes_held: int = 0  # memory-bounded search: most nodes in memory at once
 
-def _reconstruct(node: _Node) -> List:
-    acts = []
-    while node.parent is not None:
-        acts.append(node.action)
-        node = node.parent
-    return list(reversed(acts))
+def _scores(states: List[Hashable], h: Callable[[Hashable], float],
+            batch_h: Optional[Callable[[List[Hashable]], Iterable[float]]]) -> Iterable[float]:
+    if not states:
+        return ()
+    return batch_h(states) if batch_h else [h(s) for s in states]
 
 def astar(problem: Any, heuristic_override: Optional[Callable[[Hashable], float]] = None,
-          time_limit_sec: float = 10.0) -> Tuple[Optional[List], Optional[float], _Metrics]:
+          time_limit_sec: float = 10.0, backend: str = "dict", queue: str = "auto",
+          tie_break: str = "deep", batch_heuristic: Optional[Callable[[List[Hashable]], Iterable[float]]] = None,
+          lazy_successors: bool = False, weight: float = 1.0, anytime: bool = False,
+          max_nodes: Optional[int] = None, bitstate_bits: int = 1 << 24, bitstate_hashes: int = 3,
+          heuristics: Optional[Sequence[Callable[[Hashable], float]]] = None,
+          partial_expansion: bool = False) -> Tuple[Optional[List], Optional[float], _Metrics]:
     """General-purpose A* algorithm, calls functions from PuzzleProblem:
-       - initial_state(), is_goal(s), successors(s) -> (action, next_state, cost)"""
-    h = heuristic_override or (lambda s: 0.0)
+       - initial_state(), is_goal(s), successors(s) -> (action, next_state, cost)
+       backend: "dict" (best_g keyed by state, interned as problem.key() ints when the problem has keys),
+       "dense" (8-puzzle only, flat 9! buffers: several times less peak memory than "dict" on deep
+       searches, which still pays a dict entry per distinct state, but slower: ranks are computed
+       in Python) or "bitstate"
+       (approximate closed set in bitstate_bits bits with bitstate_hashes hash functions; may miss
+       states with probability metrics.omission_prob, so neither optimality nor completeness is
+       guaranteed and metrics.bound is inf)
+       queue: "auto" (bucket queue while every f is integral, heap otherwise), "bucket", "radix" or "heap"
+       tie_break: order among equal f in the bucket queue, "deep" (largest g first) or "shallow" (smallest g)
+       batch_heuristic: scores all surviving successors of a node in one call (e.g. batch_heuristics.h1_batch)
+       A heuristic with h_state/h_delta/value (e.g. requirement_2.h1_incremental) is maintained
+       from the two swapped cells reported by problem.successors_indexed(s).
+       lazy_successors: use problem.moves(s) descriptors and child_key(); duplicates are rejected on
+       the key and only pushed children are materialized with problem.apply(s, i, j).
+       weight: weighted A*, f = g + weight * h; the plan costs at most weight * optimal (metrics.bound)
+       anytime: ARA* starting at weight (see ara_star); returns the best plan found within time_limit_sec,
+       metrics.bound is its proven suboptimality bound
+       max_nodes: memory-bounded search (see sma_star) holding at most max_nodes nodes at once
+       heuristics: admissible heuristics ordered cheapest first, instead of heuristic_override (Lazy A*):
+       heuristics[0] scores every generated child, the others are evaluated one at a time only when the
+       node reaches the top of the open list; h is the max seen so far and a node whose f rises is
+       re-queued instead of expanded. metrics.h_evals / h_time_ms hold calls and time per heuristic.
+       partial_expansion: EPEA* (see epea_star), only children whose f equals the node's current f are
+       generated; without heuristic_override it uses requirement_2.h2_tile_distance and its move tables
+       anytime, max_nodes and partial_expansion are separate searches: they exclude each other and
+       backend / queue / tie_break / lazy_successors (and weight, except for anytime; heuristics and
+       batch_heuristic for partial_expansion); such combinations raise ValueError.
+       To pause and resume instead of giving up at time_limit_sec, use SearchHandle directly."""
+    if anytime or max_nodes is not None or partial_expansion:
+        unsupported = [name for name, used in (
+            ("backend", backend != "dict"), ("queue", queue != "auto"), ("tie_break", tie_break != "deep"),
+            ("lazy_successors", lazy_successors), ("weight", weight != 1.0 and not anytime),
+            ("heuristics", bool(heuristics) and (partial_expansion or heuristic_override is not None
+                                                  or batch_heuristic is not None)),
+            ("batch_heuristic", batch_heuristic is not None and partial_expansion),
+            ("several of anytime / max_nodes / partial_expansion",
+             [anytime, max_nodes is not None, partial_expansion].count(True) > 1)) if used]
+        if unsupported:
+            raise ValueError("Unsupported options for this search mode: " + ", ".join(unsupported))
+    if partial_expansion:
+        return epea_star(problem, heuristic_override, time_limit_sec=time_limit_sec)
+    if anytime or max_nodes is not None:
+        h = heuristic_override or (lambda s: 0.0)
+        if batch_heuristic is not None and heuristic_override is None:
+            h = lambda s: float(batch_heuristic([s])[0])
+        if heuristics:
+            h = lambda s: max(float(hk(s)) for hk in heuristics)
+        if max_nodes is not None:
+            return sma_star(problem, h, max_nodes=max_nodes, time_limit_sec=time_limit_sec)
+        M = _Metrics()
+        actions, cost = None, None
+        for actions, cost, _ in ara_star(problem, h, weight=weight, time_limit_sec=time_limit_sec, metrics=M):
+            pass
+        return actions, cost, M
+    handle = SearchHandle(problem, heuristic_override, backend=backend, queue=queue, tie_break=tie_break,
+                          batch_heuristic=batch_heuristic, lazy_successors=lazy_successors, weight=weight,
+                          bitstate_bits=bitstate_bits, bitstate_hashes=bitstate_hashes, heuristics=heuristics)
+    return handle.run(time_budget_sec=time_limit_sec)
+
+class SearchHandle:
+    """An A* search (same options as astar) that can be paused and resumed.
+       - run(time_budget_sec, node_budget) continues from where the last call stopped
+       - done is True once the goal was found or the open list ran out; result is (actions, cost)
+       - save(path) writes open list, closed set and node arena to disk; load(path, problem, ...)
+         rebuilds the search in any process (heuristics are code, so they are passed again)
+       Metrics accumulate over all slices."""
+    _VERSION = 3
+
+    def __init__(self, problem: Any, heuristic_override: Optional[Callable[[Hashable], float]] = None,
+                 backend: str = "dict", queue: str = "auto", tie_break: str = "deep",
+                 batch_heuristic: Optional[Callable[[List[Hashable]], Iterable[float]]] = None,
+                 lazy_successors: bool = False, weight: float = 1.0, bitstate_bits: int = 1 << 24,
+                 bitstate_hashes: int = 3, heuristics: Optional[Sequence[Callable[[Hashable], float]]] = None):
+        start_t = time.perf_counter()
+        h = heuristic_override or (lambda s: 0.0)
+        if batch_heuristic is not None and heuristic_override is None:
+            h = lambda s: float(batch_heuristic([s])[0])
+        self.M = _Metrics(bound=float("inf") if backend == "bitstate" else weight)
+        # Lazy A*: per node, the best h so far and how many of the heuristics produced it
+        self.heuristics: Optional[List[Callable[[Hashable], float]]] = None
+        self.hvals: Optional[array] = None
+        self.levels: Optional[bytearray] = None
+        if heuristics:
+            if heuristic_override is not None or batch_heuristic is not None:
+                raise ValueError("Pass heuristics or heuristic_override / batch_heuristic, not both")
+            self.heuristics = [self._timed(k, hk) for k, hk in enumerate(heuristics)]
+            self.M.h_evals, self.M.h_time_ms = [0] * len(heuristics), [0.0] * len(heuristics)
+            self.hvals, self.levels = array("d"), bytearray()
+            h = self.heuristics[0]
+        self.problem = problem
+        self.options = dict(backend=backend, queue=queue, tie_break=tie_break, lazy_successors=lazy_successors,
+                            weight=weight, bitstate_bits=bitstate_bits, bitstate_hashes=bitstate_hashes)
+        self.h = h
+        self.batch_heuristic = batch_heuristic
+        self.incremental = (batch_heuristic is None and hasattr(h, "h_delta")
+                            and hasattr(problem, "successors_indexed"))
+        # Stores intern problem.key() ints (PuzzleProblem: packed boards) rather than state tuples
+        # whenever the problem has keys; the dense store ranks tuples directly unless successors are lazy
+        keyed = lazy_successors or (backend != "dense" and hasattr(problem, "key"))
+        self.store = _make_store(backend, problem, keyed, bitstate_bits, bitstate_hashes)
+        self.key = problem.key if keyed else (lambda s: s)
+        self.done = False
+        self.result: Tuple[Optional[List], Optional[float]] = (None, None)
+
+        # Open list holds node indices into the arena; best_g is indexed by state id
+        start = problem.initial_state()
+        self.arena = _NodeArena()
+        root = self.arena.add(self.store.sid(self.key(start)), 0.0, -1, None)
+        self.hstates: Optional[List] = [h.h_state(start)] if self.incremental else None
+        h0 = h(start)
+        if self.heuristics:
+            self.hvals.append(h0)
+            self.levels.append(1)
+        self.openq = _push(_make_queue(queue, tie_break), root, weight * h0, 0.0)
+        self.M.time_ms = (time.perf_counter() - start_t) * 1000
+
+    def _timed(self, k: int, hk: Callable[[Hashable], float]) -> Callable[[Hashable], float]:
+        """hk counted and timed into M.h_evals[k] / M.h_time_ms[k]."""
+        def h(s: Hashable) -> float:
+            t = time.perf_counter()
+            v = float(hk(s))
+            self.M.h_evals[k] += 1
+            self.M.h_time_ms[k] += (time.perf_counter() - t) * 1000
+            return v
+        return h
+
+    def run(self, time_budget_sec: Optional[float] = None,
+            node_budget: Optional[int] = None) -> Tuple[Optional[List], Optional[float], _Metrics]:
+        """Search until done or until the slice's time / popped-node budget is used up.
+        Returns (actions, cost, metrics); (None, None, metrics) while paused or when unsolvable."""
+        if self.done:
+            return self.result[0], self.result[1], self.M
+        problem, store, arena, openq, M = self.problem, self.store, self.arena, self.openq, self.M
+        h, batch_heuristic, incremental, hstates, key = (self.h, self.batch_heuristic, self.incremental,
+                                                         self.hstates, self.key)
+        lazy_successors, w = self.options["lazy_successors"], self.options["weight"]
+        lazy_hs, hvals, levels = self.heuristics, self.hvals, self.levels
+        limit = float("inf") if time_budget_sec is None else time_budget_sec
+        popped = 0
+        start_t = time.perf_counter()
+        base_ms = M.time_ms
+
+        try:
+            while not openq.empty():
+                if (time.perf_counter() - start_t) > limit or popped == node_budget:
+                    return None, None, M
+
+                n = openq.pop()
+                popped += 1
+                sid, g = arena.state_id[n], arena.g[n]
+                if g >= store.g[sid]:
+                    continue
+                s = store.state(sid)
+                if problem.is_goal(s):
+                    self.done, self.result = True, (arena.path(n), g)
+                    return arena.path(n), g, M
+                if lazy_hs is not None and levels[n] < len(lazy_hs):
+                    # Lazy A*: evaluate the next heuristics now; re-queue as soon as f rises
+                    requeued = False
+                    while levels[n] < len(lazy_hs):
+                        hk = lazy_hs[levels[n]](s)
+                        levels[n] += 1
+                        if hk > hvals[n]:
+                            hvals[n] = hk
+                            openq = _push(openq, n, g + w * hk, g)
+                            requeued = True
+                            break
+                    if requeued:
+                        continue
+                store.close(sid, g)
+
+                if lazy_successors:
+                    k = key(s)
+                    for code, i, j, cost in problem.moves(s):
+                        g2 = g + cost
+                        sid2 = store.sid(problem.child_key(k, i, j))
+                        if g2 < store.g[sid2]:
+                            if incremental:
+                                hs2 = h.h_delta(hstates[n], i, j)
+                                hstates.append(hs2)
+                                h2 = h.value(hs2)
+                            else:
+                                h2 = h(problem.apply(s, i, j))
+                            if lazy_hs is not None:
+                                hvals.append(h2)
+                                levels.append(1)
+                            openq = _push(openq, arena.add(sid2, g2, n, ACTIONS[code]), g2 + w * h2, g2)
+                            M.expanded += 1
+                elif incremental:
+                    hs = hstates[n]
+                    for action, s2, cost, i, j in problem.successors_indexed(s):
+                        g2 = g + cost
+                        sid2 = store.sid(key(s2))
+                        if g2 < store.g[sid2]:
+                            hs2 = h.h_delta(hs, i, j)
+                            hstates.append(hs2)
+                            openq = _push(openq, arena.add(sid2, g2, n, action), g2 + w * h.value(hs2), g2)
+                            M.expanded += 1
+                else:
+                    kids = []
+                    for action, s2, cost in problem.successors(s):
+                        g2 = g + cost
+                        sid2 = store.sid(key(s2))
+                        if g2 < store.g[sid2]:
+                            kids.append((sid2, g2, action, s2))
+                    for (sid2, g2, action, _), h2 in zip(kids, _scores([k[3] for k in kids], h, batch_heuristic)):
+                        if lazy_hs is not None:
+                            hvals.append(h2)
+                            levels.append(1)
+                        openq = _push(openq, arena.add(sid2, g2, n, action), g2 + w * float(h2), g2)
+                        M.expanded += 1
+                M.max_fringe = max(M.max_fringe, len(openq))
+
+            self.done = True
+            return None, None, M
+        finally:
+            self.openq = openq
+            if isinstance(store, _BitStore):
+                M.omission_prob = store.filter.false_positive_rate()
+            M.time_ms = base_ms + (time.perf_counter() - start_t) * 1000
+
+    def save(self, path: str):
+        """Checkpoint the search to path (pickle of flat arrays, written atomically)."""
+        arena, store = self.arena, self.store
+        if isinstance(store, _DenseStore):
+            closed = store.closed_ranks
+            closed_set = ("dense", closed, array("d", (store.g[r] for r in closed)))
+        elif isinstance(store, _BitStore):
+            closed_set = ("bits", (store.filter.bits, store.filter.n), store.states)
+        else:
+            closed_set = ("dict", store.states, store.g)
+        data = dict(version=self._VERSION, options=self.options, start=self.problem.initial_state(),
+                    metrics=astuple(self.M),
+                    done=self.done, result=self.result,
+                    arena=(arena.state_id, arena.g, arena.parent, arena.action, arena.action_names),
+                    closed=closed_set, open=self.openq.snapshot(),
+                    lazy=(self.hvals, self.levels) if self.heuristics else None)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str, problem: Any, heuristic_override: Optional[Callable[[Hashable], float]] = None,
+             batch_heuristic: Optional[Callable[[List[Hashable]], Iterable[float]]] = None,
+             heuristics: Optional[Sequence[Callable[[Hashable], float]]] = None) -> "SearchHandle":
+        """Rebuild a search saved with save(); problem must have the same initial state."""
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+        if data.get("version") != cls._VERSION:
+            raise ValueError("Unknown checkpoint version")
+        if data["start"] != problem.initial_state():
+            raise ValueError("Checkpoint does not match problem")
+        handle = cls(problem, heuristic_override, batch_heuristic=batch_heuristic, heuristics=heuristics,
+                     **data["options"])
+        handle.M = _Metrics(*data["metrics"])
+        if handle.heuristics:
+            if not data.get("lazy"):
+                raise ValueError("Checkpoint was not saved with heuristics")
+            handle.hvals, handle.levels = data["lazy"]
+        handle.done, handle.result = data["done"], data["result"]
+
+        arena = handle.arena
+        arena.state_id, arena.g, arena.parent, arena.action, arena.action_names = data["arena"]
+        arena._action_ids = {a: i for i, a in enumerate(arena.action_names)}
+        kind, a, b = data["closed"]
+        store = handle.store
+        if kind == "dense":
+            for r, g in zip(a, b):
+                store.close(r, g)
+        elif kind == "bits":
+            store.filter.bits, store.filter.n = a
+            store.states = b
+        else:
+            store.states, store.g = a, b
+            store._ids = {s: i for i, s in enumerate(a)}
+
+        handle.openq = _restore_queue(data["open"], handle.options["tie_break"])
+        nodes = data["open"][2]
+        if handle.incremental:
+            # h states are only needed for nodes that will still be expanded
+            handle.hstates = [None] * len(arena.g)
+            for n in nodes:
+                handle.hstates[n] = handle.h.h_state(store.state(arena.state_id[n]))
+        return handle
+
+def ara_star(problem: Any, heuristic: Optional[Callable[[Hashable], float]] = None,
+             weight: float = 3.0, step: float = 0.5, time_limit_sec: float = 10.0,
+             metrics: Optional[_Metrics] = None) -> Iterable[Tuple[List, float, _Metrics]]:
+    """Anytime Repairing A* (Likhachev et al. 2003): weighted A* with a falling weight.
+       - each iteration reuses g and the parents of the previous one; only states whose g
+         improved after they were closed (INCONS) are searched again, not the whole tree
+       - yields (actions, cost, metrics) whenever the plan or its bound improves, where
+         metrics.bound = min(weight, cost / min(g + h over OPEN and INCONS)), 1.0 once proven optimal
+       - stops at time_limit_sec; the plans yielded so far stay valid
+       Bounds assume an admissible heuristic. metrics (if given) is updated in place."""
+    h = heuristic or (lambda s: 0.0)
+    start_t = time.perf_counter()
+    M = metrics if metrics is not None else _Metrics()
+    M.bound = float("inf")
     start = problem.initial_state()
+    if problem.is_goal(start):
+        M.bound = 1.0
+        M.time_ms = (time.perf_counter() - start_t) * 1000
+        yield [], 0.0, replace(M)
+        return
+
+    g: Dict[Hashable, float] = {start: 0.0}
+    hv: Dict[Hashable, float] = {start: h(start)}
+    parent: Dict[Hashable, Tuple] = {start: (None, None)}
+    open_set, incons = {start}, set()
+    best_cost, best_state = float("inf"), None
+    last_cost = float("inf")
+    eps = max(1.0, weight)
+    c = 0
+
+    def plan(s) -> List:
+        acts = []
+        while parent[s][0] is not None:
+            s, a = parent[s]
+            acts.append(a)
+        return list(reversed(acts))
+
+    while True:
+        # ImprovePath: weighted A* until no open state can beat the incumbent
+        closed = set()
+        heap = []
+        for s in open_set:
+            heap.append((g[s] + eps * hv[s], c, g[s], s))
+            c += 1
+        heapq.heapify(heap)
+        while heap:
+            if (time.perf_counter() - start_t) > time_limit_sec:
+                M.time_ms = (time.perf_counter() - start_t) * 1000
+                return
+            f, _, gs, s = heap[0]
+            if s not in open_set or gs != g[s]:
+                heapq.heappop(heap)
+                continue
+            if f >= best_cost:
+                break
+            heapq.heappop(heap)
+            open_set.discard(s)
+            closed.add(s)
+            for action, s2, cost in problem.successors(s):
+                g2 = gs + cost
+                if g2 >= g.get(s2, float("inf")):
+                    continue
+                g[s2] = g2
+                parent[s2] = (s, action)
+                M.expanded += 1
+                if problem.is_goal(s2):
+                    if g2 < best_cost:
+                        best_cost, best_state = g2, s2
+                    continue
+                if s2 not in hv:
+                    hv[s2] = h(s2)
+                if s2 in closed:
+                    incons.add(s2)
+                else:
+                    open_set.add(s2)
+                    heapq.heappush(heap, (g2 + eps * hv[s2], c, g2, s2))
+                    c += 1
+            M.max_fringe = max(M.max_fringe, len(open_set) + len(incons))
+
+        if best_state is None:
+            M.time_ms = (time.perf_counter() - start_t) * 1000
+            return
+        lower = min((g[s] + hv[s] for s in open_set | incons), default=float("inf"))
+        bound = max(1.0, min(eps, best_cost / lower if lower > 0 else eps))
+        if bound < M.bound or best_cost < last_cost:
+            M.bound, last_cost = bound, best_cost
+            M.time_ms = (time.perf_counter() - start_t) * 1000
+            yield plan(best_state), best_cost, replace(M)
+        if bound <= 1.0:
+            return
+        eps = max(1.0, eps - step)
+        open_set |= incons
+        incons = set()
+
+class _ProbedH:
+    """Plain heuristic seen through the h_state / h_delta / value interface (builds every child)."""
+    def __init__(self, h: Callable[[Hashable], float]):
+        self.h = h
+
+    def h_state(self, state):
+        return state, float(self.h(state))
+
+    def h_delta(self, parent_h_state, i: int, j: int):
+        u = list(parent_h_state[0])
+        u[i], u[j] = u[j], u[i]
+        return tuple(u), float(self.h(tuple(u)))
+
+    def value(self, h_state) -> float:
+        return h_state[1]
+
+def epea_star(problem: Any, heuristic: Optional[Callable[[Hashable], float]] = None,
+              time_limit_sec: float = 10.0) -> Tuple[Optional[List], Optional[float], _Metrics]:
+    """Enhanced Partial Expansion A* (Felner et al. 2012).
+       A popped node generates only the children whose f equals its stored value F, then goes back
+       to OPEN with F = the next larger child f (or leaves it once no child is left), so children
+       with f above the optimal cost are never generated and the open list stays small.
+       - child f values come without building children when the heuristic has delta(h_state, i, j)
+         (operator-selection tables, e.g. requirement_2.h2_tile_distance, the default); any other
+         heuristic with h_state / h_delta / value, or a plain callable, is evaluated per child
+       - problem must provide moves(s) and apply(s, i, j) (PuzzleProblem does)
+       Optimal for a consistent heuristic. metrics.expanded counts generated nodes, as in astar."""
+    h = heuristic or h2_tile_distance
+    if not hasattr(h, "h_delta"):
+        h = _ProbedH(h)
+    delta = getattr(h, "delta", None)
     start_t = time.perf_counter()
     M = _Metrics()
+    start = problem.initial_state()
 
-    openq = _PriorityQueue()
-    openq.push(_Node(start, g=0.0, action=None, parent=None), priority=h(start))
-    best_g: Dict[Hashable, float] = {}
+    g: Dict[Hashable, float] = {start: 0.0}
+    hs: Dict[Hashable, Any] = {start: h.h_state(start)}
+    parent: Dict[Hashable, Tuple] = {start: (None, None)}
+    heap = [(h.value(hs[start]), 0.0, 0, start)]  # (F, -g, counter, state): deepest first on ties
+    c = 1
 
-    while not openq.empty():
+    def plan(s) -> List:
+        acts = []
+        while parent[s][0] is not None:
+            s, a = parent[s]
+            acts.append(a)
+        return list(reversed(acts))
+
+    while heap:
         if (time.perf_counter() - start_t) > time_limit_sec:
             M.time_ms = (time.perf_counter() - start_t) * 1000
             return None, None, M
+        F, neg_g, _, s = heapq.heappop(heap)
+        gs = -neg_g
+        if gs != g[s]:
+            continue
+        hn = h.value(hs[s])
+        first = F == gs + hn
+        if first and problem.is_goal(s):
+            M.time_ms = (time.perf_counter() - start_t) * 1000
+            return plan(s), gs, M
 
-        node = openq.pop()
-        s = node.state
-        if problem.is_goal(s):
+        # Children with f == F now (f < F too on the first visit); remember the next larger f
+        nxt = float("inf")
+        for code, i, j, cost in problem.moves(s):
+            if delta:
+                hs2, fc = None, gs + cost + hn + delta(hs[s], i, j)
+            else:
+                hs2 = h.h_delta(hs[s], i, j)
+                fc = gs + cost + h.value(hs2)
+            if fc > F:
+                nxt = min(nxt, fc)
+                continue
+            if fc < F and not first:
+                continue
+            s2 = problem.apply(s, i, j)
+            g2 = gs + cost
+            if g2 >= g.get(s2, float("inf")):
+                continue
+            g[s2] = g2
+            hs[s2] = h.h_delta(hs[s], i, j) if hs2 is None else hs2
+            parent[s2] = (s, ACTIONS[code])
+            heapq.heappush(heap, (fc, -g2, c, s2))
+            c += 1
+            M.expanded += 1
+        if nxt < float("inf"):
+            heapq.heappush(heap, (nxt, neg_g, c, s))
+            c += 1
+        M.max_fringe = max(M.max_fringe, len(heap))
+
+    M.time_ms = (time.perf_counter() - start_t) * 1000
+    return None, None, M
+
+class _SMANode:
+    __slots__ = ("state", "g", "f", "depth", "parent", "action", "children", "forgotten", "lost", "ver", "open")
+
+    def __init__(self, state: Hashable, g: float, f: float, depth: int, parent: Optional["_SMANode"], action: Any):
+        self.state, self.g, self.f, self.depth = state, g, f, depth
+        self.parent, self.action = parent, action
+        self.children: List["_SMANode"] = []
+        self.forgotten = float("inf")  # min f of children dropped from memory
+        self.lost: Dict[Hashable, float] = {}  # their states -> backed-up f, restored on regeneration
+        self.ver = 0
+        self.open = False
+
+def sma_star(problem: Any, heuristic: Optional[Callable[[Hashable], float]] = None,
+             max_nodes: int = 100_000, time_limit_sec: float = 10.0) -> Tuple[Optional[List], Optional[float], _Metrics]:
+    """Simplified memory-bounded A* (Russell 1992): never holds more than max_nodes nodes.
+       - when memory is full the worst leaf (highest f, then shallowest) is dropped and its parent
+         remembers its f; a node with forgotten children stays selectable under the least of them
+         and, once it is the best option again, regenerates them with their remembered f
+       - f is path-max'ed on generation and backed up to parents as the min over their children
+       - a non-goal node at depth max_nodes - 1 has no room for children and gets f = inf
+       - a child is skipped if the same state is already in memory with a g no worse
+       - children are added best first, each evicting a worse leaf when memory is full (the first
+         one always gets room); those that do not fit are remembered like dropped ones
+       Optimal for an admissible h whenever an optimal path fits in max_nodes, else (None, None, M).
+       metrics.max_nodes_held is the most nodes held at once (<= max_nodes), max_fringe the most
+       heap entries (stale entries are compacted away, so at most 2 * max_nodes + 64)."""
+    if max_nodes < 1:
+        raise ValueError("max_nodes must be positive")
+    INF = float("inf")
+    h = heuristic or (lambda s: 0.0)
+    start = problem.initial_state()
+    start_t = time.perf_counter()
+    M = _Metrics()
+
+    # Lazy heaps: best = selectable nodes by (f, deepest), where a node with children in memory
+    # is keyed by its forgotten f; worst = leaves only by (-f, shallowest)
+    best: List = []
+    worst: List = []
+    c = 0
+    n_open = 0
+
+    def live(entry) -> bool:
+        return entry[4].open and entry[3] == entry[4].ver
+
+    def enter(node: _SMANode):
+        nonlocal c, n_open, best, worst
+        if not node.open:
+            node.open = True
+            n_open += 1
+        node.ver += 1
+        if len(best) > 2 * n_open + 64:
+            # Too many stale entries: rebuild both heaps from the live ones
+            best = [e for e in best if live(e)]
+            worst = [e for e in worst if live(e)]
+            heapq.heapify(best)
+            heapq.heapify(worst)
+        if node.children:
+            heapq.heappush(best, (node.forgotten, -node.depth, c, node.ver, node))
+        else:
+            heapq.heappush(best, (node.f, -node.depth, c, node.ver, node))
+            heapq.heappush(worst, (-node.f, node.depth, c, node.ver, node))
+        c += 1
+
+    def leave(node: _SMANode):
+        nonlocal n_open
+        node.open = False
+        node.ver += 1
+        n_open -= 1
+
+    def top(heap: List) -> Optional[_SMANode]:
+        while heap and not live(heap[0]):
+            heapq.heappop(heap)
+        return heap[0][4] if heap else None
+
+    def drop_worst() -> bool:
+        """Forget the worst leaf (never the root); False if there is none."""
+        nonlocal used
+        w = top(worst)
+        if w is None or w.parent is None:
+            return False
+        leave(w)
+        p = w.parent
+        p.children.remove(w)
+        p.forgotten = min(p.forgotten, w.f)
+        p.lost[w.state] = w.f
+        if mem.get(w.state) is w:
+            del mem[w.state]
+        used -= 1
+        if p is not busy:
+            enter(p)
+        return True
+
+    def backup(node: Optional[_SMANode]):
+        while node is not None and node.children:
+            f = min(min(ch.f for ch in node.children), node.forgotten)
+            if f == node.f:
+                break
+            node.f = f
+            node = node.parent
+
+    root = _SMANode(start, 0.0, h(start), 0, None, None)
+    mem: Dict[Hashable, _SMANode] = {start: root}
+    used = 1
+    busy: Optional[_SMANode] = None  # node being expanded, re-entered once its children are placed
+    enter(root)
+
+    while True:
+        if (time.perf_counter() - start_t) > time_limit_sec:
+            break
+        n = top(best) if best else None
+        if n is None or best[0][0] == INF:
+            break
+        if problem.is_goal(n.state):
+            acts = []
+            g = n.g
+            while n.parent is not None:
+                acts.append(n.action)
+                n = n.parent
             M.time_ms = (time.perf_counter() - start_t) * 1000
-            return _reconstruct(node), node.g, M
+            return list(reversed(acts)), g, M
 
-        prev = best_g.get(s, float("inf"))
-        if node.g >= prev:
-            continue
-        best_g[s] = node.g
+        # A leaf generates all successors, a partially expanded node only its forgotten ones
+        # (children still in memory are skipped as duplicates below)
+        leave(n)
+        busy = n
+        lost, n.lost = n.lost, {}
+        n.forgotten = INF
+        kids = []
+        for action, s2, cost in problem.successors(n.state):
+            g2 = n.g + cost
+            old = mem.get(s2)
+            if old is not None and old.g <= g2:
+                continue
+            f2 = max(n.f, lost.get(s2, 0.0), g2 + h(s2))
+            if n.depth + 1 >= max_nodes - 1 and not problem.is_goal(s2):
+                f2 = INF
+            kids.append((f2, g2, action, s2))
+
+        # Children go in best first; when memory is full a leaf elsewhere is dropped only if it
+        # is worse than the child (the first child always gets room, the path to n leaves it),
+        # otherwise the remaining children are only remembered in n.forgotten / n.lost
+        kids.sort(key=lambda k: k[0])
+        for i, (f2, g2, action, s2) in enumerate(kids):
+            if used >= max_nodes:
+                w = top(worst)
+                if w is None or (n.children and w.f <= f2) or not drop_worst():
+                    n.forgotten = min(n.forgotten, f2)
+                    n.lost.update((k[3], k[0]) for k in kids[i:])
+                    break
+            child = _SMANode(s2, g2, f2, n.depth + 1, n, action)
+            n.children.append(child)
+            mem[s2] = child
+            used += 1
+            enter(child)
+            M.expanded += 1
+        if n.children:
+            if n.forgotten < INF:
+                enter(n)
+            backup(n)
+        else:
+            n.f = n.forgotten
+            enter(n)
+            backup(n.parent)
+        M.max_fringe = max(M.max_fringe, len(best), len(worst))
+        M.max_nodes_held = max(M.max_nodes_held, used)
+
+    M.time_ms = (time.perf_counter() - start_t) * 1000
+    return None, None, M
+
+class _SearchTimeout(Exception):
+    pass
+
+def idastar(problem: Any, heuristic: Optional[Callable[[Hashable], float]] = None,
+            time_limit_sec: float = 10.0, tt_size: int = 100_000) -> Tuple[Optional[List], Optional[float], _Metrics]:
+    """Iterative-deepening A*: depth-first probes bounded by f = g + h, O(depth) memory.
+       - tt_size bounds the transposition table (state -> (bound, g)), oldest entries are evicted
+       - the child equal to the parent is skipped (every PuzzleProblem move is its own inverse)
+       max_fringe reports the deepest path held in memory."""
+    h = heuristic or (lambda s: 0.0)
+    start = problem.initial_state()
+    start_t = time.perf_counter()
+    M = _Metrics()
+    tt: "OrderedDict[Hashable, Tuple[float, float]]" = OrderedDict()
+    path: List = []
+    found: List[float] = []
 
+    def dfs(s, parent, g: float, bound: float) -> float:
+        if (time.perf_counter() - start_t) > time_limit_sec:
+            raise _SearchTimeout()
+        f = g + h(s)
+        if f > bound:
+            return f
+        if problem.is_goal(s):
+            found.append(g)
+            return f
+
+        # Same state already searched in this iteration with a g no worse -> nothing new below
+        seen = tt.get(s)
+        if seen is not None and seen[0] == bound and seen[1] <= g:
+            return float("inf")
+        tt[s] = (bound, g)
+        tt.move_to_end(s)
+        if len(tt) > tt_size:
+            tt.popitem(last=False)
+
+        M.max_fringe = max(M.max_fringe, len(path) + 1)
+        nxt = float("inf")
         for action, s2, cost in problem.successors(s):
-            g2 = node.g + cost
-            prev2 = best_g.get(s2, float("inf"))
-            if g2 < prev2:
-                openq.push(_Node(s2, g=g2, action=action, parent=node), priority=g2 + h(s2))
-                M.expanded += 1
-        M.max_fringe = max(M.max_fringe, len(openq))
+            if s2 == parent:
+                continue
+            M.expanded += 1
+            path.append(action)
+            t = dfs(s2, s, g + cost, bound)
+            if found:
+                return t
+            path.pop()
+            nxt = min(nxt, t)
+        return nxt
+
+    bound = h(start)
+    try:
+        while True:
+            t = dfs(start, None, 0.0, bound)
+            if found:
+                M.time_ms = (time.perf_counter() - start_t) * 1000
+                return list(path), found[0], M
+            if t == float("inf"):
+                break
+            bound = t
+    except _SearchTimeout:
+        pass
 
     M.time_ms = (time.perf_counter() - start_t) * 1000
     return None, None, M
@@ -6,9 +6,11 @@ import tracemalloc
 from collections import deque
 
 # Import from existing modules
-from task1.puzzle_rule import PuzzleProblem, GOAL, NEIGHBORS
+from task1.puzzle_rule import PuzzleProblem, GOAL, NEIGHBORS, encode
 from task1.requirement_2 import h0_zero, h1_misplaced_swap_adjust
-from task1.requirement_4 import astar, _Metrics
+from task1.requirement_4 import astar, sma_star, _Metrics
+from task1.state_index import DenseStateIndex, ACTION_CODE, NO_ACTION, NO_PARENT, rank_packed
+from task1.bitstate import BitStateSet
 
 def write_to_report(text: str, file_path: str = "task1/complexity_report.txt", mode: str = "a"):
 
@@ -36,7 +38,14 @@ class ComplexityMetrics:
                 f"MaxFrontier: {self.max_frontier_size:7d}")
 
 
-def bfs(problem: PuzzleProblem, time_limit_sec: float = 10.0) -> Tuple[List, float, _Metrics]:
+def bfs(problem: PuzzleProblem, time_limit_sec: float = 10.0, backend: str = "dict",
+        max_nodes: int = None, bitstate_bits: int = 1 << 24, bitstate_hashes: int = 3) -> Tuple[List, float, _Metrics]:
+    # backend: "dict" (fastest), "dense" (flat 9! buffers: ~10x less peak memory on deep searches,
+    # ~2x slower since ranks are computed in Python), "numpy", "external" or "bitstate"
+    # max_nodes: memory-bounded mode, uniform-cost SMA* (same depth as BFS for unit costs)
+    if max_nodes is not None:
+        return sma_star(problem, h0_zero, max_nodes=max_nodes, time_limit_sec=time_limit_sec)
+
     start_time = time.perf_counter()
     start_state = problem.initial_state()
     M = _Metrics()
@@ -45,14 +54,33 @@ def bfs(problem: PuzzleProblem, time_limit_sec: float = 10.0) -> Tuple[List, flo
         M.time_ms = (time.perf_counter() - start_time) * 1000
         return [], 0.0, M
     
+    if backend == "dense":
+        return _bfs_dense(problem, start_time, M, time_limit_sec)
+    elif backend == "numpy":
+        # Layer-synchronous, vectorized (needs numpy)
+        from task1.numpy_bfs import numpy_bfs
+        return numpy_bfs(problem, time_limit_sec)
+    elif backend == "external":
+        # Layers on disk with delayed duplicate detection (see external_bfs for layer stats)
+        from task1.external_bfs import external_bfs
+        return external_bfs(problem, time_limit_sec)[:3]
+    elif backend not in ("dict", "bitstate"):
+        raise ValueError("Unknown backend")
+    
     frontier = deque([(start_state, [], 0.0)])  # (state, actions, cost)
-    explored = {start_state}
+    if backend == "bitstate":
+        # Fixed-size approximate explored set; may skip states (see M.omission_prob), so the
+        # plan is not proven optimal: bound = inf. The frontier still grows as usual.
+        M.bound = float("inf")
+        explored = BitStateSet(bitstate_bits, bitstate_hashes)
+        explored.add(start_state)
+    else:
+        explored = {start_state}
     
     while frontier:
         # Check time limit
         if (time.perf_counter() - start_time) > time_limit_sec:
-            M.time_ms = (time.perf_counter() - start_time) * 1000
-            return None, None, M
+            break
         
         current_state, actions, cost = frontier.popleft()
         
@@ -64,13 +92,56 @@ def bfs(problem: PuzzleProblem, time_limit_sec: float = 10.0) -> Tuple[List, flo
                 new_cost = cost + step_cost
                 
                 if problem.is_goal(next_state):
+                    if backend == "bitstate":
+                        M.omission_prob = explored.false_positive_rate()
                     M.time_ms = (time.perf_counter() - start_time) * 1000
                     return actions + [action], new_cost, M
                 
                 frontier.append((next_state, actions + [action], new_cost))
                 M.max_fringe = max(M.max_fringe, len(frontier))
     
-    # No solution found
+    # No solution found (or out of time)
+    if backend == "bitstate":
+        M.omission_prob = explored.false_positive_rate()
+    M.time_ms = (time.perf_counter() - start_time) * 1000
+    return None, None, M
+
+
+def _bfs_dense(problem: PuzzleProblem, start_time: float, M: _Metrics,
+               time_limit_sec: float) -> Tuple[List, float, _Metrics]:
+    # Frontier holds packed boards only; explored/parents/actions live in flat 9! buffers
+    idx = DenseStateIndex()
+    succ = problem.successors_packed
+    goal_codes = {encode(g) for g in getattr(problem, "goals", (GOAL,))}
+    c0 = encode(problem.initial_state())
+    r0 = rank_packed(c0)
+    idx.record(r0, 0.0, NO_PARENT, NO_ACTION)
+    idx.closed[r0] = 1
+    frontier = deque([c0])
+    
+    while frontier:
+        if (time.perf_counter() - start_time) > time_limit_sec:
+            M.time_ms = (time.perf_counter() - start_time) * 1000
+            return None, None, M
+        
+        code = frontier.popleft()
+        r = rank_packed(code)
+        cost = idx.g[r]
+        
+        for action, c2, step_cost in succ(code):
+            r2 = rank_packed(c2)
+            if not idx.closed[r2]:
+                idx.closed[r2] = 1
+                idx.record(r2, cost + step_cost, r, ACTION_CODE[action])
+                M.expanded += 1
+                
+                if c2 in goal_codes:
+                    M.time_ms = (time.perf_counter() - start_time) * 1000
+                    return idx.path_to(r2), cost + step_cost, M
+                
+                frontier.append(c2)
+                M.max_fringe = max(M.max_fringe, len(frontier))
+    
     M.time_ms = (time.perf_counter() - start_time) * 1000
     return None, None, M
 
@@ -0,0 +1,91 @@
+# task1/state_index.py
+# Dense state index: every 8-puzzle permutation gets a perfect-hash rank 0..9!-1
+from array import array
+from typing import List, Tuple
+
+from task1.puzzle_rule import ACTIONS
+
+N_STATES = 362880  # 9!
+
+ACTION_CODE = {a: i for i, a in enumerate(ACTIONS)}
+NO_PARENT = -1
+NO_ACTION = 255
+
+# _FACT[i] = (8 - i)!, weight of the i-th Lehmer digit
+_FACT = (40320, 5040, 720, 120, 24, 6, 2, 1, 1)
+_POPCOUNT = bytes(bin(m).count("1") for m in range(512))
+
+
+def rank(state: Tuple[int, ...]) -> int:
+    """Lehmer rank of a permutation of 0..8 (lexicographic, 0..9!-1)."""
+    r = 0
+    used = 0
+    for i in range(8):
+        v = state[i]
+        r += (v - _POPCOUNT[used & ((1 << v) - 1)]) * _FACT[i]
+        used |= 1 << v
+    return r
+
+
+def rank_packed(code: int) -> int:
+    """rank() of a board packed with puzzle_rule.encode()."""
+    r = 0
+    used = 0
+    for i in range(8):
+        v = (code >> (4 * i)) & 0xF
+        r += (v - _POPCOUNT[used & ((1 << v) - 1)]) * _FACT[i]
+        used |= 1 << v
+    return r
+
+
+def unrank(r: int) -> Tuple[int, ...]:
+    """Inverse of rank()."""
+    free = list(range(9))
+    out = []
+    for i in range(9):
+        q, r = divmod(r, _FACT[i])
+        out.append(free.pop(q))
+    return tuple(out)
+
+
+class DenseStateIndex:
+    """Flat per-state buffers sized 9!, indexed by rank():
+       - g: best known cost (inf = unseen)
+       - parent: rank of the parent state (NO_PARENT for the root)
+       - action: code into ACTIONS (NO_ACTION for the root)
+       - closed: 1 once the state has been expanded / explored
+    paths=False skips parent / action (None) for callers that keep parents elsewhere.
+    """
+    def __init__(self, paths: bool = True):
+        self.g = array("d", [float("inf")]) * N_STATES
+        self.parent = array("i", [NO_PARENT]) * N_STATES if paths else None
+        self.action = bytearray([NO_ACTION]) * N_STATES if paths else None
+        self.closed = bytearray(N_STATES)
+
+    def nbytes(self) -> int:
+        n = self.g.itemsize * len(self.g) + len(self.closed)
+        if self.parent is not None:
+            n += self.parent.itemsize * len(self.parent) + len(self.action)
+        return n
+
+    def record(self, r: int, g: float, parent: int, action_code: int):
+        self.g[r] = g
+        self.parent[r] = parent
+        self.action[r] = action_code
+
+    def path_to(self, r: int) -> List[str]:
+        """Walk parent ranks back to the root and return the actions in order."""
+        acts = []
+        while self.parent[r] != NO_PARENT:
+            acts.append(ACTIONS[self.action[r]])
+            r = self.parent[r]
+        return list(reversed(acts))
+
+
+if __name__ == "__main__":
+    #quick test for this file
+    from task1.puzzle_rule import GOAL
+    print("rank(GOAL) =", rank(GOAL), "->", unrank(rank(GOAL)))
+    print("rank((0..8)) =", rank(tuple(range(9))), " rank((8..0)) =", rank(tuple(range(8, -1, -1))))
+    idx = DenseStateIndex()
+    print(f"DenseStateIndex: {idx.nbytes() / 2**20:.2f} MB for {N_STATES} states")
@@ -0,0 +1,191 @@
+# task1/symmetry.py
+# Symmetries of the MOVE / SWAP9 / SWAP_DIAG rule set and canonical class representatives
+import time
+from array import array
+from bisect import bisect_left
+from typing import Iterable, List, Sequence, Tuple
+
+from task1.puzzle_rule import PuzzleProblem, GOAL, encode, decode
+
+# A symmetry is (perm, relabel): tile at cell i moves to cell perm[i]; relabel maps v -> 9 - v (v != 0).
+# The 8 grid symmetries keep NEIGHBORS and CORNER_PAIRS, relabelling keeps A + B = 9, and none of them
+# changes an action's type, so a plan's action labels are the same for every member of a class.
+Symmetry = Tuple[Tuple[int, ...], bool]
+
+_GRID_MAPS = (
+    lambda r, c: (r, c), lambda r, c: (c, 2 - r), lambda r, c: (2 - r, 2 - c), lambda r, c: (2 - c, r),
+    lambda r, c: (r, 2 - c), lambda r, c: (2 - r, c), lambda r, c: (c, r), lambda r, c: (2 - c, 2 - r),
+)
+GRID_PERMS: List[Tuple[int, ...]] = [tuple(3 * r + c for r, c in (m(i // 3, i % 3) for i in range(9)))
+                                     for m in _GRID_MAPS]
+
+SYMMETRIES: List[Symmetry] = [(p, relabel) for relabel in (False, True) for p in GRID_PERMS]
+IDENTITY: Symmetry = SYMMETRIES[0]
+
+
+def transform(sym: Symmetry, state: Tuple[int, ...]) -> Tuple[int, ...]:
+    perm, relabel = sym
+    out = [0] * 9
+    for i, v in enumerate(state):
+        out[perm[i]] = (9 - v) if (relabel and v) else v
+    return tuple(out)
+
+
+def inverse(sym: Symmetry) -> Symmetry:
+    perm, relabel = sym
+    inv = [0] * 9
+    for i, j in enumerate(perm):
+        inv[j] = i
+    return tuple(inv), relabel
+
+
+def stabilizer(goals: Iterable[Tuple[int, ...]]) -> List[Symmetry]:
+    """Symmetries that map the goal set onto itself (the ones a goal-directed search may use)."""
+    goal_set = {tuple(g) for g in goals}
+    return [s for s in SYMMETRIES if {transform(s, g) for g in goal_set} == goal_set]
+
+
+def canonical(state: Tuple[int, ...], group: Sequence[Symmetry] = SYMMETRIES) -> Tuple[Tuple[int, ...], Symmetry]:
+    """(representative, sym) with transform(sym, state) == representative, the smallest image."""
+    best, best_sym = None, IDENTITY
+    for sym in group:
+        t = transform(sym, state)
+        if best is None or t < best:
+            best, best_sym = t, sym
+    return best, best_sym
+
+
+class SymmetricProblem:
+    """PuzzleProblem seen through its symmetry classes: every state is replaced by canonical(state).
+    goals is the wrapped problem's goal set and group defaults to its stabilizer, so is_goal and
+    path costs are unchanged (a single GOAL only has the identity); since
+    action labels are symmetric, a plan found here is a plan for the original start as it is.
+    states_back(states) turns a path of class representatives from self.start back into boards."""
+    def __init__(self, problem, goals: Sequence[Tuple[int, ...]] = None, group: Sequence[Symmetry] = None):
+        self.problem = problem
+        if goals is None:
+            goals = getattr(problem, "goals", (GOAL,))
+        self.group = list(group) if group is not None else stabilizer(goals)
+        self.start, self.start_sym = canonical(problem.initial_state(), self.group)
+
+    def initial_state(self) -> Tuple[int, ...]:
+        return self.start
+
+    def is_goal(self, s: Tuple[int, ...]) -> bool:
+        return self.problem.is_goal(s)
+
+    def successors(self, s: Tuple[int, ...]):
+        for action, s2, cost in self.problem.successors(s):
+            yield action, canonical(s2, self.group)[0], cost
+
+    def states_back(self, states: Iterable[Tuple[int, ...]], sym: Symmetry = None) -> List[Tuple[int, ...]]:
+        """Original boards for a path of representatives; sym produced the first one (default start_sym).
+        Each step canonicalizes under its own symmetry, so every next board is re-derived as the
+        successor of the previous board whose representative is the next one on the path."""
+        states = list(states)
+        if not states:
+            return []
+        out = [transform(inverse(sym or self.start_sym), states[0])]
+        for rep in states[1:]:
+            for _, s2, _ in self.problem.successors(out[-1]):
+                if canonical(s2, self.group)[0] == rep:
+                    out.append(s2)
+                    break
+            else:
+                raise ValueError("States are not a path of representatives")
+        return out
+
+
+class ClassDistanceTable:
+    """Exact distance to the nearest of goals, one byte per symmetry class of the stabilizer.
+    Representatives are kept as a sorted array of packed codes; dist() canonicalizes and bisects."""
+    def __init__(self, goals: Sequence[Tuple[int, ...]] = (GOAL,)):
+        self.group = stabilizer(goals)
+        depth_of = {}
+        layer = {encode(canonical(g, self.group)[0]) for g in goals}
+        depth = 0
+        while layer:
+            for code in layer:
+                depth_of[code] = depth
+            nxt = set()
+            for code in layer:
+                s = decode(code)
+                for _, s2, _ in _successors(s):
+                    c2 = encode(canonical(s2, self.group)[0])
+                    if c2 not in depth_of:
+                        nxt.add(c2)
+            layer = nxt
+            depth += 1
+        self.codes = array("Q", sorted(depth_of))
+        self.data = bytearray(depth_of[c] for c in self.codes)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def dist(self, state: Tuple[int, ...]) -> int:
+        code = encode(canonical(state, self.group)[0])
+        return self.data[bisect_left(self.codes, code)]
+
+
+def _successors(s: Tuple[int, ...]):
+    return PuzzleProblem(s).successors(s)
+
+
+def class_sizes(group: Sequence[Symmetry] = SYMMETRIES) -> List[int]:
+    """Number of symmetry classes per BFS layer from GOAL's class (goal-free sweep of all of 9!)."""
+    seen = {encode(canonical(GOAL, group)[0])}
+    layer = list(seen)
+    sizes = []
+    while layer:
+        sizes.append(len(layer))
+        nxt = []
+        for code in layer:
+            for _, s2, _ in _successors(decode(code)):
+                c2 = encode(canonical(s2, group)[0])
+                if c2 not in seen:
+                    seen.add(c2)
+                    nxt.append(c2)
+        layer = nxt
+    return sizes
+
+
+if __name__ == "__main__":
+    #quick test for this file
+    import random
+    from task1.requirement_2 import GOALS
+    from task1.requirement_4 import astar, scramble_from_goal
+    from task1.oracle import reverse_bfs
+    from task1.state_index import rank
+
+    # every symmetry maps successors to successors with the same action label
+    s = scramble_from_goal(15, seed=4)
+    for sym in SYMMETRIES:
+        a = sorted((act, transform(sym, s2)) for act, s2, _ in PuzzleProblem(s).successors(s))
+        t = transform(sym, s)
+        assert a == sorted((act, s2) for act, s2, _ in PuzzleProblem(t).successors(t))
+    print("All 16 symmetries preserve the rules")
+    print("Stabilizer sizes: GOAL", len(stabilizer([GOAL])), "GOALS", len(stabilizer(GOALS)))
+
+    t0 = time.perf_counter()
+    sizes = class_sizes()
+    print(f"Goal-free sweep: {sum(sizes)} classes instead of 362880 states ({time.perf_counter() - t0:.1f}s)")
+
+    t0 = time.perf_counter()
+    table = ClassDistanceTable(GOALS)
+    exact = reverse_bfs(GOALS)
+    ok = all(table.dist(x) == exact[rank(x)] for x in (scramble_from_goal(k, seed=k) for k in range(40)))
+    print(f"GOALS class table: {len(table)} entries instead of 362880, matches reverse_bfs: {ok} "
+          f"({time.perf_counter() - t0:.1f}s)")
+
+    prob = SymmetricProblem(PuzzleProblem(s), goals=[GOAL])
+    print("Plan through SymmetricProblem:", astar(prob)[1], "direct:", astar(PuzzleProblem(s))[1])
+
+    # a random walk over GOALS-set representatives maps back to a walk of legal moves
+    sym_prob = SymmetricProblem(PuzzleProblem(s, GOALS))
+    path = [sym_prob.start]
+    rng = random.Random(0)
+    for _ in range(30):
+        path.append(rng.choice([s2 for _, s2, _ in sym_prob.successors(path[-1])]))
+    back = sym_prob.states_back(path)
+    assert back[0] == s and all(b in [x for _, x, _ in PuzzleProblem(a).successors(a)] for a, b in zip(back, back[1:]))
+    print("states_back gives legal moves along a 30-step walk")
@@ -1,18 +1,149 @@
-from task1.requirement_4 import astar
+import os, random, tempfile
+from task1.requirement_4 import astar, idastar, SearchHandle, sma_star
 from task1.puzzle_rule import PuzzleProblem
-from task1.requirement_2 import h0_zero, h1_misplaced_swap_adjust
+from task1.requirement_2 import GOALS, h0_zero, h1_misplaced_swap_adjust, h1_incremental, h2_tile_distance
+from task1.pattern_db import h_pdb_max
+from task1.oracle import get_table
+from task1.state_index import N_STATES, unrank
+from task1.symmetry import SymmetricProblem
+from task1.bidirectional import bidirectional_bfs, bidirectional_astar
+from task1.batch_solve import solve_many
+from task1.batch_heuristics import h1_batch
+from task1.hda_star import hda_star
+from task1.parallel_astar import parallel_astar
+from task1.requirement_8 import bfs
+from task1.portfolio import portfolio_solve
 
 def run_case(name, start):
     prob = PuzzleProblem(start)
     acts0, cost0, m0 = astar(prob, heuristic_override=h0_zero, time_limit_sec=2.0)
     acts1, cost1, m1 = astar(prob, heuristic_override=h1_misplaced_swap_adjust, time_limit_sec=2.0)
+    acts2, cost2, m2 = astar(prob, heuristic_override=h1_misplaced_swap_adjust, time_limit_sec=2.0, backend="dense")
+    acts3, cost3, m3 = astar(prob, heuristic_override=h_pdb_max, time_limit_sec=2.0)
+
+    # H0 again, paused every 5 nodes and reloaded from a checkpoint file
+    ck = os.path.join(tempfile.gettempdir(), "astar_checkpoint.bin")
+    handle = SearchHandle(prob, h0_zero)
+    while not handle.done:
+        acts4, cost4, m4 = handle.run(node_budget=5)
+        handle.save(ck)
+        handle = SearchHandle.load(ck, prob, h0_zero)
+    os.remove(ck)
+    acts5, cost5, m5 = astar(prob, heuristic_override=h_pdb_max, time_limit_sec=2.0, weight=2.0)
+    acts6, cost6, m6 = astar(prob, heuristic_override=h_pdb_max, time_limit_sec=2.0, weight=3.0, anytime=True)
+    acts7, cost7, m7 = astar(prob, heuristic_override=h_pdb_max, time_limit_sec=2.0, max_nodes=50)
+    acts8, cost8, m8 = astar(PuzzleProblem(start, GOALS), heuristic_override=h0_zero, time_limit_sec=2.0)
+    acts9, cost9, m9 = astar(prob, heuristics=[h0_zero, h_pdb_max], time_limit_sec=2.0)
+    acts10, cost10, m10 = astar(prob, time_limit_sec=2.0, partial_expansion=True)
 
     print(f"\n=== {name} ===")
     print("Start:", start)
     print(f"H0 -> cost={cost0}, expanded={m0.expanded}, time_ms={m0.time_ms:.2f}")
     print(f"H1 -> cost={cost1}, expanded={m1.expanded}, time_ms={m1.time_ms:.2f}")
+    print(f"H1 (dense) -> cost={cost2}, expanded={m2.expanded}, time_ms={m2.time_ms:.2f}")
+    print(f"PDB max -> cost={cost3}, expanded={m3.expanded}, time_ms={m3.time_ms:.2f}")
+    print(f"H0 (resumed) -> cost={cost4}, expanded={m4.expanded}, time_ms={m4.time_ms:.2f}")
+    print(f"PDB max (w=2) -> cost={cost5}, expanded={m5.expanded}, time_ms={m5.time_ms:.2f}")
+    print(f"PDB max (ARA*) -> cost={cost6}, bound={m6.bound}, expanded={m6.expanded}, time_ms={m6.time_ms:.2f}")
+    print(f"PDB max (SMA*, 50 nodes) -> cost={cost7}, expanded={m7.expanded}, time_ms={m7.time_ms:.2f}")
+    print(f"H0 (any of GOALS) -> cost={cost8}, expanded={m8.expanded}, time_ms={m8.time_ms:.2f}")
+    print(f"Lazy H0 + PDB max -> cost={cost9}, evals={m9.h_evals}, time_ms={m9.time_ms:.2f}")
+    print(f"EPEA* H2 -> cost={cost10}, max_fringe={m10.max_fringe}, time_ms={m10.time_ms:.2f}")
 
     assert cost0 == cost1, "A* must give the same optimal for both H0 and H1"
+    assert cost1 == cost2, "Dense backend must match the dict backend"
+    assert cost0 == cost3, "PDB heuristic must be admissible"
+    assert cost0 == cost4 and m0.expanded == m4.expanded, "Resumed search must match one uninterrupted run"
+    assert cost5 <= 2.0 * cost0, "Weighted A* must stay within its bound"
+    assert cost6 == cost0 and m6.bound == 1.0, "ARA* must end with a proven optimal plan"
+    assert cost7 == cost0, "SMA* must stay optimal when the solution fits in memory"
+    assert cost8 == get_table(GOALS).dist(start) <= cost0, "Multi-goal search must reach the nearest goal"
+    assert cost9 == cost0 and m9.h_evals[1] <= m9.h_evals[0], "Lazy A* must stay optimal with fewer PDB calls"
+    assert cost10 == cost0, "EPEA* must stay optimal"
+    assert astar(prob, heuristic_override=h0_zero, backend="bitstate")[2].bound == float("inf"), \
+        "Bitstate plans must not be reported as proven optimal"
+    for options in (dict(partial_expansion=True, heuristics=[h0_zero, h_pdb_max]), dict(max_nodes=50, weight=2.0)):
+        try:
+            astar(prob, **options)
+        except ValueError:
+            continue
+        raise AssertionError("Unsupported option combinations must raise ValueError")
+
+def deep_starts(n=3, min_cost=15, seed=7):
+    """Random states at least min_cost moves from GOAL (by the oracle)."""
+    table, rng, out = get_table(), random.Random(seed), []
+    while len(out) < n:
+        s = unrank(rng.randrange(N_STATES))
+        if table.dist(s) >= min_cost:
+            out.append(s)
+    return out
+
+def run_deep_checks():
+    table = get_table()
+    print("\n=== Deep scrambles ===")
+    starts = deep_starts()
+    for start in starts:
+        opt = table.dist(start)
+        prob = PuzzleProblem(start)
+        print("Start:", start, "optimal cost:", opt)
+
+        acts, cost, m = sma_star(prob, h_pdb_max, max_nodes=100, time_limit_sec=5.0)
+        assert cost == opt, "SMA* must stay optimal when the solution fits in memory"
+        assert m.max_nodes_held <= 100 and m.max_fringe <= 2 * 100 + 65, "SMA* must respect its node cap"
+
+        assert idastar(prob, h_pdb_max)[1] == opt, "IDA* must be optimal with an admissible heuristic"
+
+        assert bidirectional_bfs(prob)[1] == opt, "BiBFS must be optimal"
+        assert bidirectional_astar(prob, h_pdb_max)[1] == opt, "MM must be optimal with an admissible heuristic"
+        # H1 may overestimate, so the batch form only has to reproduce the scalar H1 search
+        cost_h1 = astar(prob, heuristic_override=h1_misplaced_swap_adjust)[1]
+        assert cost_h1 >= opt and astar(prob, batch_heuristic=h1_batch)[1] == cost_h1, "Batch H1 must match scalar H1"
+        assert astar(prob, heuristic_override=h1_incremental)[1] == cost_h1, "Incremental H1 must match scalar H1"
+        assert astar(prob, heuristic_override=h_pdb_max, lazy_successors=True)[1] == opt, "Lazy successors must stay optimal"
+        assert hda_star(prob, h_pdb_max, workers=2)[1] == opt, "HDA* must be optimal"
+        assert parallel_astar(prob, h_pdb_max, threads=2)[1] == opt, "Thread-parallel A* must be optimal"
+        assert bfs(prob, backend="numpy")[1] == opt, "Numpy BFS must be optimal"
+        multi, opt_multi = PuzzleProblem(start, GOALS), get_table(GOALS).dist(start)
+        assert bidirectional_bfs(multi)[1] == opt_multi, "BiBFS must meet the nearest of GOALS"
+        assert bidirectional_astar(multi, h2_tile_distance)[1] == opt_multi, "MM must meet the nearest of GOALS"
+
+        sym = SymmetricProblem(PuzzleProblem(start, GOALS))
+        assert astar(sym, h2_tile_distance)[1] == get_table(GOALS).dist(start), "Symmetry classes must keep costs"
+        rng, path = random.Random(opt), [sym.start]
+        for _ in range(20):
+            path.append(rng.choice([s2 for _, s2, _ in sym.successors(path[-1])]))
+        back = sym.states_back(path)
+        assert back[0] == start and all(b in [x for _, x, _ in prob.successors(a)] for a, b in zip(back, back[1:])), \
+            "Symmetry paths must map back to legal moves"
+
+    # Saving a heap-ordered search (FIFO ties, weighted f) must not change it, reloaded or not
+    ck = os.path.join(tempfile.gettempdir(), "astar_checkpoint.bin")
+    prob = PuzzleProblem(starts[0])
+    for options in (dict(queue="heap"), dict(weight=1.5)):
+        ref = SearchHandle(prob, h1_misplaced_swap_adjust, **options).run()
+        for reload in (False, True):
+            handle = SearchHandle(prob, h1_misplaced_swap_adjust, **options)
+            while not handle.done:
+                acts, cost, m = handle.run(node_budget=500)
+                handle.save(ck)
+                if reload:
+                    handle = SearchHandle.load(ck, prob, h1_misplaced_swap_adjust)
+            assert (cost, m.expanded) == (ref[1], ref[2].expanded), "Checkpoints must not change the search"
+    os.remove(ck)
+
+    # Tight SMA* cap: the optimal path fits in 40 nodes, the f-contours around it do not
+    for start in [(8,7,2,6,1,3,5,4,0), (7,8,1,2,6,4,5,0,3), (0,3,4,2,6,7,5,8,1), (2,3,8,5,4,6,0,1,7)] + starts:
+        acts, cost, m = sma_star(PuzzleProblem(start), h_pdb_max, max_nodes=40, time_limit_sec=5.0)
+        assert cost == table.dist(start) and m.max_nodes_held <= 40, "SMA* must stay optimal under a tight cap"
+
+    acts, cost, m, name = portfolio_solve(starts[0], deadline=0.0)
+    assert acts is None and m.bound == float("inf"), "An empty portfolio result must not look proven optimal"
+
+    plans, _ = solve_many(starts)
+    assert [cost for _, cost in plans] == [table.dist(s) for s in starts], "solve_many must match the oracle"
+    # external BFS goes through disk, so one deep start is enough
+    assert bfs(PuzzleProblem(starts[0]), backend="external", time_limit_sec=60.0)[1] == table.dist(starts[0]), \
+        "External BFS must be optimal"
 
 if __name__ == "__main__":
     
@@ -20,6 +151,7 @@ if __name__ == "__main__":
     run_case("Near-goal", (1,2,3,4,5,6,0,7,8))
     run_case("Adj swap 9 candidate", (1,2,3,4,5,6,7,0,8))
     run_case("Diagonal swap candidate", (8,2,3,4,5,6,7,0,1))
+    run_deep_checks()
     print("\nAll quick tests passed")
 
 # Test requirement 3